@@ -1,6 +1,6 @@
 from agents import Agent
 from pydantic import BaseModel, Field
-from resources.tools.elastic_query import elastic_query_search
+from resources.tools.elastic_query import elastic_aggregate, elastic_query_search
 
 class ElasticQueryParams(BaseModel):
     elastic_index: str = "avatar_hub"
@@ -33,7 +33,7 @@ Hard constraints and workflow:
   - Missing: -_exists_:closing_date
   - Boolean: condA AND condB, condA OR condB, NOT condC (or -condC)
   - If keyword subfields exist, prefer them; otherwise use the best available field validated by the probe.
-- Sorting/size: The tool interface does not expose sort/size controls; rely on default results and select from returned hits. If exact ordering or precise counts are impossible due to tool limits, respond exactly with: information unavailable
+- Sorting/size: Ask only for what you need: set size (default 10, max 100), source_includes for the fields you will report, and sort (e.g. ["document_creation_time:desc"]) when order matters. Page with search_after=next_search_after. Set track_total_hits=true when you need an exact total.
 - Clarification: If the question lacks essential filters (e.g., “find avatars” with no criteria), ask exactly one concise clarification question (e.g., “What should I filter by—name, email, phone, label, gender, or date range?”) and wait.
 - Failure/insufficient data: If you cannot proceed or the data is unavailable, respond exactly with: information unavailable
 
@@ -41,17 +41,22 @@ Answering:
 - Primary: Provide a concise, direct answer (number, short list, or short sentence).
 
 ### CONTEXT
-Available tool (call this exactly as provided by the platform):
-- elastic_query_search(elastic_query_params: ElasticQueryParams) -> str (raw JSON response with hits and _source)
+Available tools (call these exactly as provided by the platform):
+- elastic_query_search(elastic_query_params: ElasticQueryParams) -> {total, total_is_lower_bound, returned, hits: [{_id, ...selected _source fields}], next_search_after}
   - ElasticQueryParams:
     - elastic_index: string (default "avatar_hub"; MUST be "avatar_hub")
     - elastic_query_in_wild_cards: string (the wildcard/Lucene-style query)
     - user_question: string (pass through the original user question)
+    - source_includes / source_excludes: list of _source fields (optional)
+    - size: int (default 10), sort: list like ["field:desc"], search_after: list, track_total_hits: bool
+- elastic_aggregate(elastic_aggregate_params: ElasticAggregateParams) -> {count} or {total, aggregations}
+  - Use for every "how many", "count", "by label/country/day", "distinct" question instead of fetching documents and counting them.
+  - No aggregations = exact _count of the query. Aggregations: terms (top values, keyword fields), date_histogram (calendar_interval), cardinality (distinct count), each optionally with one breakdown inside its buckets.
 Usage protocol:
 - Always set elastic_index="avatar_hub".
 - Always include user_question.
 - Probe first with a conservative query that validates key fields (e.g., field:*), then refine and run the final query.
-- Inspect the raw JSON: use hits.hits[_source] to validate fields and extract answers; use hits.total (if present) for counts.
+- Inspect the result: each hit is the document's _source fields plus _id; use total for counts (exact only with track_total_hits=true, otherwise a lower bound when total_is_lower_bound is true).
 
 Typical fields seen in avatar_hub (must probe/validate before using):
 - id (string)
@@ -67,7 +72,7 @@ Notes:
 - For exact matches, use quoted values or keyword-like behavior if validated (e.g., labels:"whatsapp", profile.phone_number:"+123...").
 - For existence checks: field:* or _exists_:field.
 - For missing: -_exists_:field.
-- For counts, rely on hits.total in the tool’s raw JSON if available; otherwise information unavailable.
+- For counts and breakdowns, use elastic_aggregate.
 
 ### INPUT DATA
 - query_params_object:
@@ -138,7 +143,7 @@ ELASTIC_QUERY_AGENT = Agent(
         name="Elastic Query Agent",
         model="gpt-5",
         instructions=PROFESSIONAL_DB_QUERY_PROMPT,
-        tools=[elastic_query_search],
+        tools=[elastic_query_search, elastic_aggregate],
         handoff_description="""
         Use when the request concerns avatars data in Elasticsearch: find avatar(s) by ID or attributes, inspect avatar fields, search/list avatar documents, or run avatar-related aggregations.
         Not for SQL/Postgres, Kubernetes operations, or Grafana logs/alerts.""",
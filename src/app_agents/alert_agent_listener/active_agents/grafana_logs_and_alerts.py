@@ -2,6 +2,7 @@ from typing import Literal
 from agents import Agent
 from pydantic import BaseModel, Field
 from resources.mcps.grafana import MCP as grafana_mcp
+from resources.tools.log_reducer import get_raw_log_lines
 
 
 class GrafanaLogsAndAlertsInput(BaseModel):
@@ -65,6 +66,7 @@ Assume you can call tools like:
 - loki.queryRange(query, start, end), loki.queryInstant(query)
 - prom.query(query, time|range)
 - sql.query(datasource, text, params)
+- Large Loki log results arrive already summarized: templates with counts, first/last seen, the Loki streams (app/pod/container labels) each template came from and verbatim error lines, plus a log_id; use get_raw_log_lines(log_id, template_id) to drill back into the original lines
 If a required tool is missing, ask for an alternative or reply: information unavailable
 
 ### BEHAVIOR
@@ -162,6 +164,7 @@ GRAFANA_LOGS_AND_ALERTS_AGENT = Agent(
         model="gpt-5",
         instructions=PROFESSIONAL_GRAFANA_LOGS_AND_ALERTS_PROMPT,
         mcp_servers=[grafana_mcp],
+        tools=[get_raw_log_lines],
         handoff_description="""
         Use for service/application logs and Grafana alerts: explain why an alert fired, retrieve/analyze logs over a time window, count errors, or answer log-based questions.
         Requires target service/alert and a time range. Not for Kubernetes actions or SQL queries.""",
@@ -5,6 +5,8 @@ from app_agents.alert_agent_listener.active_agents.grafana_logs_and_alerts impor
 from app_agents.alert_agent_listener.active_agents.richie_k8s_helper import K8S_HELPER_AGENT, K8sQueryParams
 from app_agents.alert_agent_listener.active_agents.simple_select_sql_query import DB_SIMPLE_QUERY_AGENT, PostgresQueryParams
 from app_agents.alert_agent_listener.custom_tools.custom_tools import trigger_telegram_manual_collection
+from app_agents.alert_agent_listener.mcp_pool import BRIGHT_DATA, GRAFANA
+from resources.mcps.pool import attach_on_handoff
 
 GENERAL_HELP_PROMPT = """
 ### ROLE / PERSONA
@@ -83,7 +85,7 @@ GENERAL_HELP_AGENT = Agent(
                     handoff(
                         DOMAIN_SCAM_FINDER,
                         tool_name_override="domains_expert",
-                        on_handoff=lambda ctx, inp: None,
+                        on_handoff=attach_on_handoff(BRIGHT_DATA),
                         input_type=DomainScamFinderInput,
                     ),
                     handoff(
@@ -101,7 +103,7 @@ GENERAL_HELP_AGENT = Agent(
                     handoff(
                         GRAFANA_LOGS_AND_ALERTS_AGENT,
                         tool_name_override="grafana_services_logs_and_alerts_expert",
-                        on_handoff=lambda ctx, inp: None,
+                        on_handoff=attach_on_handoff(GRAFANA),
                         input_type=GrafanaLogsAndAlertsInput,
                     ),
                     handoff(
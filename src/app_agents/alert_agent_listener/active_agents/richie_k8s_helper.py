@@ -1,6 +1,7 @@
 from agents import Agent
 from pydantic import BaseModel, Field
-from resources.tools.k8s import get_all_namespaces, get_all_deployments, get_deployment_status, get_pods_per_deployment, set_deployment_replicas, get_pod_logs
+from resources.tools.k8s import get_all_namespaces, get_all_deployments, get_deployment_status, get_pods_per_deployment, set_deployment_replicas, get_pod_logs, get_deployment_logs, follow_pod_logs, get_namespace_health, get_events, get_pod_metrics, explain_pod_restarts
+from resources.tools.log_reducer import get_raw_log_lines
 
 class K8sQueryParams(BaseModel):
     namespace: str = Field(description="the namespace of the k8s cluster to select from - like telegram_management", default="enrichment")
@@ -48,9 +49,15 @@ Use user_question + provided fields to determine if you have sufficient informat
   - If deployment/pod/container is provided, verify existence before proceeding
 - Read-only tasks:
   - Logs: Need namespace + one of [deployment | pod]. If container is omitted, default to single-container pods; if multiple containers exist, ask which one (show options).
+  - Deployment logs: use get_deployment_logs for one merged, timestamp-ordered view across all pods and containers instead of fetching each pod separately.
+  - Log tools return a reduced summary (templates with counts, first/last seen, verbatim error lines). Use get_raw_log_lines with the log_id (and a template_id) to drill into specific lines; pass raw=True only when the exact full output is needed.
+  - Repeated log checks on the same pod: call get_pod_logs with only_new=True to get just the lines since your last call. For live debugging use follow_pod_logs with a short max_seconds/max_lines budget.
+  - "What's broken / unhealthy in <namespace>?": call get_namespace_health once; it returns deployments ranked by severity with replica gaps, container problems, restarts and Warning events. Drill into specific pods only afterwards.
+  - "Why did this pod restart / is it OOMing / throttled?": call explain_pod_restarts (termination reasons, limits, events, usage). Use get_events for Events by object or reason and get_pod_metrics for live CPU/memory against limits.
   - Describe/Get/List: Namespace + target kind/name or label selector. If ambiguous, list candidates and ask the user to pick.
 - Write/risky tasks (scale, patch, image update, delete):
   - Require explicit resource (e.g., deployment name) and namespace confirmation. Show a preview/dry-run and ask for explicit confirmation before applying.
+  - When scaling, call set_deployment_replicas with wait_for_ready=True: it watches the rollout server-side and returns the readiness timeline, so do not poll get_deployment_status afterwards.
 - If validation probes or tools cannot retrieve required info or permissions are insufficient, respond exactly with: information unavailable
 
 ### INSTRUCTION
@@ -362,7 +369,7 @@ K8S_HELPER_AGENT = Agent(
         name="K8s Helper Agent",
         model="gpt-5",
         instructions=RICHIE_K8S_HELPER_PROMPT,
-        tools=[get_all_namespaces, get_all_deployments, get_deployment_status, get_pods_per_deployment, set_deployment_replicas, get_pod_logs],
+        tools=[get_all_namespaces, get_all_deployments, get_deployment_status, get_pods_per_deployment, set_deployment_replicas, get_pod_logs, get_deployment_logs, follow_pod_logs, get_namespace_health, get_events, get_pod_metrics, explain_pod_restarts, get_raw_log_lines],
         handoff_description="""
         Use to query or change state in the Richie Kubernetes cluster: list/get namespaces, deployments, pods, containers; fetch pod logs; scale deployments; check rollout/status. 
         Requires namespace (most in 'enrichment') and resource names. 
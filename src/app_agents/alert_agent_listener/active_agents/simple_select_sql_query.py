@@ -1,6 +1,6 @@
 from agents import Agent
 from pydantic import BaseModel, Field
-from resources.tools.postgres_simple_select import DatabaseName, postgres_simple_select, postgres_simple_select_example_run, get_all_schemas_in_db, get_all_tables_in_schema
+from resources.tools.postgres_simple_select import DatabaseName, postgres_simple_select, postgres_aggregate_select, postgres_simple_select_example_run, get_all_schemas_in_db, get_all_tables_in_schema
 
 class PostgresQueryParams(BaseModel):
     database_name: DatabaseName = Field(description="the name of the database to select from - like telegram_management", default=DatabaseName.ALTERYA_MAIN)
@@ -22,6 +22,7 @@ Given a user_question and optional query constraints, determine the minimal data
 - Treat these fields as query hints and constraints. If a field is missing or unusable, inspect the database to fill gaps before querying.
 - Always use database tools to verify schema and run queries. Never guess or fabricate schema or data.
 - Prefer aggregation/filters to compute the answer instead of returning bulk rows. Retrieve only what is necessary to answer user_question.
+- For counts, sums, averages, min/max and breakdowns (GROUP BY, per-day/hour buckets) use postgres_aggregate_select so the database computes the result; never pull rows to count them yourself.
 - Keep ORDER BY simple: <column> <ASC|DESC>. Use Postgres syntax unless a different sql_dialect is explicitly provided.
 - If results are paginated by the tool, iterate until you have enough to answer; otherwise clearly indicate how to fetch the remaining pages.
 - If the technical requirements are not clear, in most cases you have enough tools to get the information you need, infer the requirements from the data you have, use tools to validate it, and then before running validate all your conclusions with the user.
@@ -122,7 +123,7 @@ DB_SIMPLE_QUERY_AGENT = Agent(
         name="DB Simple Query Agent",
         model="gpt-5",
         instructions=PROFESSIONAL_DB_QUERY_PROMPT,
-        tools=[postgres_simple_select, postgres_simple_select_example_run, get_all_schemas_in_db, get_all_tables_in_schema],
+        tools=[postgres_simple_select, postgres_aggregate_select, postgres_simple_select_example_run, get_all_schemas_in_db, get_all_tables_in_schema],
         handoff_description="""
         Use for SQL against the alterya main Postgres database: SELECT queries, list schemas/tables, counts/filters/order/limit. 
         Requires schema.table (ask if missing); optional columns/where/order/limit. 
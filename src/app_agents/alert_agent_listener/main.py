@@ -4,14 +4,18 @@ import os
 from agents import Runner
 from app_agents.alert_agent_listener.active_agents.orchestrator_im import GENERAL_HELP_AGENT
 from app_agents.alert_agent_listener.const import ChannelType
+from app_agents.alert_agent_listener.mcp_pool import MCP_POOL
 
 from app_agents.alert_agent_listener.slack_utils import channel_type_is, fetch_last_messages_in_im
 from slack_bolt.async_app import AsyncApp
 from slack_bolt.adapter.socket_mode.async_handler import AsyncSocketModeHandler
 import logging
 
-from resources.mcps.bright_data import MCP as bright_data_mcp
-from resources.mcps.grafana import MCP as grafana_mcp
+from resources.tools.elastic_query import close_session as close_elastic_session
+from resources.tools.http_request import close_session as close_http_session
+from resources.tools.k8s_client import close_api_client
+from resources.tools.k8s_informer import stop_informers
+from resources.tools.postgres_simple_select import dispose_engines
 
 from slack_sdk import WebClient
 
@@ -20,6 +24,7 @@ from dotenv import load_dotenv
 load_dotenv()
 
 logging.basicConfig(level=logging.INFO, format="%(asctime)s %(levelname)s %(name)s: %(message)s")
+logger = logging.getLogger(__name__)
 
 
 SLACK_BOT_TOKEN = os.getenv("SLACK_BOT_TOKEN")
@@ -39,25 +44,20 @@ async def on_im(body, client, say, logger):
         latest_ts=message["ts"],  # include the triggering message as the anchor
         limit=10,
     )
-    
-    await bright_data_mcp.connect()
-    logger.info("Connected to bright data mcp")
 
-    await grafana_mcp.connect()
-    logger.info("Connected to grafana mcp")
-    
-    result = await Runner.run(
-            GENERAL_HELP_AGENT,
-            input=history,
-            max_turns=50,
-        )
+    # Handoffs attach the MCP servers they need to these leases; released when the run ends.
+    async with MCP_POOL.run_leases() as mcp_leases:
+        result = await Runner.run(
+                GENERAL_HELP_AGENT,
+                input=history,
+                context=mcp_leases,
+                max_turns=50,
+            )
     try:
         await say(result.final_output or "(no output)")
     except Exception as exc:
         logger.exception("Failed to send Slack message", exc_info=exc)
 
-    await grafana_mcp.cleanup()
-    await bright_data_mcp.cleanup()
     logger.info(f"[IM] {message['channel']} {message.get('user')}: {message.get('text','')}")
     logger.info(body)
 
@@ -103,8 +103,30 @@ async def main():
         raise Exception(f"Auth failed: {result}")
     
     print("Starting socket mode handler")
-    await AsyncSocketModeHandler(app, SLACK_APP_TOKEN).start_async()
-    
+    try:
+        await AsyncSocketModeHandler(app, SLACK_APP_TOKEN).start_async()
+    finally:
+        await shutdown()
+
+
+async def shutdown():
+    """Release shared resources; a failing step is logged and does not stop the others."""
+    steps = {
+        "MCP pool": MCP_POOL.stop(),
+        "Postgres engines": dispose_engines(),
+        "k8s informers": stop_informers(),
+        "Elasticsearch session": close_elastic_session(),
+        "HTTP session": close_http_session(),
+    }
+    results = dict(zip(steps, await asyncio.gather(*steps.values(), return_exceptions=True)))
+    # The informers watch through the shared ApiClient, so it is closed only after they have stopped.
+    try:
+        await close_api_client()
+    except Exception as e:
+        results["k8s API client"] = e
+    for name, result in results.items():
+        if isinstance(result, BaseException):
+            logger.error(f"Failed to close {name} on shutdown", exc_info=result)
 
 
 if __name__ == "__main__":
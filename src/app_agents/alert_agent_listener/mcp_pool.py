@@ -0,0 +1,13 @@
+from resources.mcps.bright_data import MCP as bright_data_mcp
+from resources.mcps.grafana import MCP as grafana_mcp
+from resources.mcps.pool import IDLE_TTL_SECONDS, MCPServerPool
+
+BRIGHT_DATA = "bright_data"
+GRAFANA = "grafana"
+
+# Servers are started by the handoff that needs them (see orchestrator_im) and
+# stopped after MCP_IDLE_TTL_SECONDS without a run using them.
+MCP_POOL = MCPServerPool(
+    {BRIGHT_DATA: bright_data_mcp, GRAFANA: grafana_mcp},
+    idle_ttl=IDLE_TTL_SECONDS,
+)
@@ -1,7 +1,7 @@
 import asyncio
 
 from agents import Agent, Runner
-from resources.tools.elastic_query import elastic_query_search
+from resources.tools.elastic_query import elastic_aggregate, elastic_query_search
 
 async def main():
     elastic_query_agent = Agent(
@@ -11,7 +11,7 @@ async def main():
         You are an elastic agent that can answer questions about avatars and avatars related knowledge which is stored in the avatar_hub index. 
         if its an elastic object or avatar related questions, then you should an you must use this context, 
         """,
-        tools=[elastic_query_search],
+        tools=[elastic_query_search, elastic_aggregate],
     )
     result = await Runner.run(
         elastic_query_agent,
@@ -1,5 +1,5 @@
 import os
-from agents.mcp import MCPServerStdio
+from resources.mcps.tools_cache import CachedToolsMCPServerStdio
 
 from dotenv import load_dotenv
 
@@ -8,7 +8,7 @@ load_dotenv()
 API_TOKEN = os.getenv("BRIGHT_DATA_API_TOKEN", "")
 
 
-MCP = MCPServerStdio(                          # <-- our npx subprocess
+MCP = CachedToolsMCPServerStdio(                          # <-- our npx subprocess
         params={
             "command": "npx",
             "args": [
@@ -1,4 +1,10 @@
-from agents.mcp import MCPServerStdio
+import json
+from typing import Any
+
+from mcp.types import CallToolResult, TextContent
+
+from resources.mcps.tools_cache import CachedToolsMCPServerStdio
+from resources.tools.log_reducer import reduce_log_text
 
 import os
 
@@ -6,9 +12,38 @@ from dotenv import load_dotenv
 
 load_dotenv()
 
+# Grafana MCP tools whose output is log lines, reduced to templates before the model sees them
+LOG_TOOLS = {"query_loki_logs"}
+# Smaller results are passed through verbatim: a summary would not save anything
+REDUCE_MIN_LINES = int(os.getenv("GRAFANA_MCP_REDUCE_MIN_LINES", "20"))
+
+
+class GrafanaMCPServer(CachedToolsMCPServerStdio):
+    """Grafana MCP server whose Loki log results come back as a log_reducer summary.
+
+    The summary keeps each line's Loki stream labels (pod, container, app...)
+    and carries a log_id, so the agent can page through the original lines
+    with get_raw_log_lines instead of receiving them all up front.
+    """
+
+    async def call_tool(self, tool_name: str, arguments: dict[str, Any] | None) -> CallToolResult:
+        result = await super().call_tool(tool_name, arguments)
+        if tool_name not in LOG_TOOLS or result.isError:
+            return result
+        text = "".join(item.text for item in result.content if isinstance(item, TextContent))
+        if not text and result.structuredContent:
+            text = json.dumps(result.structuredContent.get("result", result.structuredContent))
+        summary = reduce_log_text(text)
+        if summary.total_lines < REDUCE_MIN_LINES:
+            return result
+        # The structured form replaces the raw entries too, so servers set to use_structured_content get the summary.
+        return result.model_copy(update={
+            "content": [TextContent(type="text", text=summary.render())],
+            "structuredContent": summary.model_dump(),
+        })
 
 
-MCP = MCPServerStdio(                          # <-- our npx subprocess
+MCP = GrafanaMCPServer(                          # <-- our npx subprocess
         params={
             "command": "docker",
             "args": [
@@ -1,6 +1,6 @@
-from agents.mcp import MCPServerStdio
+from resources.mcps.tools_cache import CachedToolsMCPServerStdio
 
-MCP = MCPServerStdio(  # <-- our stdio subprocess
+MCP = CachedToolsMCPServerStdio(  # <-- our stdio subprocess
         params={
             "command": "playwright-mcp",
             "args": [
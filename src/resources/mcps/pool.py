@@ -0,0 +1,213 @@
+import asyncio
+import logging
+import os
+import time
+from contextlib import AsyncExitStack, asynccontextmanager
+from typing import Any, AsyncIterator
+
+from agents import RunContextWrapper
+from agents.mcp import MCPServer
+
+
+logger = logging.getLogger(__name__)
+
+HEALTH_CHECK_INTERVAL_SECONDS = float(os.getenv("MCP_HEALTH_CHECK_INTERVAL_SECONDS", "30"))
+HEALTH_CHECK_TIMEOUT_SECONDS = float(os.getenv("MCP_HEALTH_CHECK_TIMEOUT_SECONDS", "10"))
+RESTART_BACKOFF_SECONDS = float(os.getenv("MCP_RESTART_BACKOFF_SECONDS", "2"))
+RESTART_BACKOFF_MAX_SECONDS = float(os.getenv("MCP_RESTART_BACKOFF_MAX_SECONDS", "60"))
+STARTUP_TIMEOUT_SECONDS = float(os.getenv("MCP_STARTUP_TIMEOUT_SECONDS", "120"))
+LEASE_WAIT_SECONDS = float(os.getenv("MCP_LEASE_WAIT_SECONDS", "30"))
+MAX_CONCURRENT_LEASES = int(os.getenv("MCP_MAX_CONCURRENT_LEASES", "8"))
+IDLE_TTL_SECONDS = float(os.getenv("MCP_IDLE_TTL_SECONDS", "600"))
+
+
+class PooledServer:
+    """Keeps one MCP server connected while it is in use.
+
+    A supervisor task owns the connection: it connects, pings the server every
+    HEALTH_CHECK_INTERVAL_SECONDS, and on a failed ping (crashed subprocess,
+    dead container) tears the session down and reconnects with exponential
+    backoff. connect() and cleanup() both run inside that one task, which the
+    anyio task groups behind the stdio transport require.
+
+    Runs share the single session (MCP multiplexes requests over it); lease()
+    bounds how many runs use it at once and waits for it to be ready.
+
+    With an idle_ttl the server is also shut down once it has had no lease for
+    that long; the next lease starts it again.
+    """
+
+    def __init__(self, name: str, server: MCPServer, idle_ttl: float | None = None):
+        self.name = name
+        self.server = server
+        self.idle_ttl = idle_ttl
+        self._ready = asyncio.Event()
+        self._stopping = asyncio.Event()
+        self._leases = asyncio.Semaphore(MAX_CONCURRENT_LEASES)
+        self._active_leases = 0
+        self._last_used = time.monotonic()
+        self._task: asyncio.Task | None = None
+
+    @property
+    def ready(self) -> bool:
+        return self._ready.is_set()
+
+    def start(self) -> bool:
+        """Start the supervisor task if it is not running; return True if it was started now."""
+        if self._task is None or self._task.done():
+            self._stopping.clear()
+            self._task = asyncio.create_task(self._supervise(), name=f"mcp-{self.name}")
+            return True
+        return False
+
+    async def stop(self) -> None:
+        self._stopping.set()
+        if self._task is not None:
+            await self._task
+            self._task = None
+
+    async def wait_ready(self, timeout: float) -> bool:
+        try:
+            await asyncio.wait_for(self._ready.wait(), timeout)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    @asynccontextmanager
+    async def lease(self) -> AsyncIterator[MCPServer]:
+        """Hold the server for one run, starting it if needed and waiting for it to be connected.
+
+        A cold start may take up to STARTUP_TIMEOUT_SECONDS, an already running
+        server (e.g. one that is reconnecting) up to LEASE_WAIT_SECONDS.
+
+        If it is still down the lease is granted anyway and logged: only the
+        agents that actually use this server will fail, not the whole run.
+        """
+        async with self._leases:
+            self._active_leases += 1
+            try:
+                timeout = STARTUP_TIMEOUT_SECONDS if self.start() else LEASE_WAIT_SECONDS
+                if not await self.wait_ready(timeout):
+                    logger.warning(f"MCP server '{self.name}' is not connected; continuing without it")
+                yield self.server
+            finally:
+                self._active_leases -= 1
+                self._last_used = time.monotonic()
+
+    def _idle_expired(self) -> bool:
+        return (
+            self.idle_ttl is not None
+            and self._active_leases == 0
+            and time.monotonic() - self._last_used >= self.idle_ttl
+        )
+
+    async def _sleep_unless_stopping(self, seconds: float) -> bool:
+        """Sleep for the given time; return True if stop() was called meanwhile."""
+        try:
+            await asyncio.wait_for(self._stopping.wait(), seconds)
+            return True
+        except asyncio.TimeoutError:
+            return False
+
+    async def _healthy(self) -> bool:
+        if not hasattr(self.server, "session"):
+            # Not a client-session server (MCPServer does not declare one); nothing to ping.
+            return True
+        session = getattr(self.server, "session")
+        if session is None:
+            return False
+        try:
+            async with asyncio.timeout(HEALTH_CHECK_TIMEOUT_SECONDS):
+                await session.send_ping()
+            return True
+        except Exception as e:
+            logger.warning(f"MCP server '{self.name}' failed health check: {e!r}")
+            return False
+
+    async def _supervise(self) -> None:
+        backoff = RESTART_BACKOFF_SECONDS
+        while not self._stopping.is_set():
+            try:
+                await self.server.connect()
+            except Exception as e:
+                if self._idle_expired():
+                    logger.warning(f"MCP server '{self.name}' failed to start: {e!r}; no run is waiting for it, giving up")
+                    break
+                logger.warning(f"MCP server '{self.name}' failed to start: {e!r}; retrying in {backoff}s")
+                if await self._sleep_unless_stopping(backoff):
+                    break
+                backoff = min(backoff * 2, RESTART_BACKOFF_MAX_SECONDS)
+                continue
+
+            logger.info(f"MCP server '{self.name}' connected")
+            backoff = RESTART_BACKOFF_SECONDS
+            self._ready.set()
+            while not await self._sleep_unless_stopping(HEALTH_CHECK_INTERVAL_SECONDS):
+                if self._idle_expired() or not await self._healthy():
+                    break
+            self._ready.clear()
+            await self.server.cleanup()
+            # Re-checked after cleanup: a lease taken while shutting down keeps the server running.
+            if self._idle_expired():
+                logger.info(f"MCP server '{self.name}' idle for {self.idle_ttl}s; shutting it down")
+                break
+            if not self._stopping.is_set():
+                logger.info(f"Restarting MCP server '{self.name}'")
+        logger.info(f"MCP server '{self.name}' stopped")
+
+
+class RunLeases:
+    """The MCP servers one agent run has attached, released together when the run ends.
+
+    Pass it as the run context so handoff hooks can attach the server the
+    receiving agent needs (see attach_on_handoff); servers no agent in the run
+    uses are never started.
+    """
+
+    def __init__(self, pool: "MCPServerPool"):
+        self._pool = pool
+        self._stack = AsyncExitStack()
+        self._held: dict[str, MCPServer] = {}
+
+    async def acquire(self, name: str) -> MCPServer:
+        if name not in self._held:
+            self._held[name] = await self._stack.enter_async_context(self._pool.server(name).lease())
+        return self._held[name]
+
+    async def __aenter__(self) -> "RunLeases":
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self._stack.aclose()
+
+
+def attach_on_handoff(name: str):
+    """on_handoff hook that attaches the named pooled server before the receiving agent runs.
+
+    Does nothing when the run was not started with a RunLeases context.
+    """
+    async def on_handoff(ctx: RunContextWrapper[Any], _input: Any) -> None:
+        if isinstance(ctx.context, RunLeases):
+            await ctx.context.acquire(name)
+
+    return on_handoff
+
+
+class MCPServerPool:
+    """The set of MCP servers a process can attach to agent runs.
+
+    A server is connected on its first lease and shut down after idle_ttl
+    seconds without one.
+    """
+
+    def __init__(self, servers: dict[str, MCPServer], idle_ttl: float | None = None):
+        self._servers = {name: PooledServer(name, server, idle_ttl) for name, server in servers.items()}
+
+    def server(self, name: str) -> PooledServer:
+        return self._servers[name]
+
+    def run_leases(self) -> RunLeases:
+        return RunLeases(self)
+
+    async def stop(self) -> None:
+        await asyncio.gather(*(pooled.stop() for pooled in self._servers.values()))
@@ -0,0 +1,59 @@
+import logging
+import os
+import time
+from typing import Any
+
+from agents.mcp import MCPServerStdio, MCPServerStdioParams
+from mcp.types import Tool as MCPTool
+
+
+logger = logging.getLogger(__name__)
+
+TOOLS_CACHE_TTL_SECONDS = float(os.getenv("MCP_TOOLS_CACHE_TTL_SECONDS", "3600"))
+
+ToolsCacheKey = tuple[str, tuple[str, ...], str, str]
+
+# Shared by every server instance, so a tool list fetched by one run (or one
+# instance of the same server) is reused by the next.
+_TOOLS_CACHE: dict[ToolsCacheKey, tuple[list[MCPTool], float]] = {}
+
+
+class CachedToolsMCPServerStdio(MCPServerStdio):
+    """MCPServerStdio whose tool list is cached across runs.
+
+    Entries are keyed by the launch command and the name/version the server
+    reports at initialize, and expire after MCP_TOOLS_CACHE_TTL_SECONDS. They
+    survive reconnects (e.g. the pool restarting a crashed server): a restart
+    that brings a new build reports a new version and so gets its own entry.
+    """
+
+    def __init__(self, params: MCPServerStdioParams, **kwargs: Any):
+        super().__init__(params=params, cache_tools_list=True, **kwargs)
+
+    def _tools_cache_key(self) -> ToolsCacheKey | None:
+        if self.server_initialize_result is None:
+            return None
+        info = self.server_initialize_result.serverInfo
+        return (self.params.command, tuple(self.params.args), info.name, info.version)
+
+    def invalidate_tools_cache(self) -> None:
+        super().invalidate_tools_cache()
+        key = self._tools_cache_key()
+        if key is not None:
+            _TOOLS_CACHE.pop(key, None)
+
+    async def list_tools(self, run_context=None, agent=None) -> list[MCPTool]:
+        key = self._tools_cache_key()
+        cached = _TOOLS_CACHE.get(key) if key is not None else None
+        fresh = False
+        if cached is not None and time.monotonic() - cached[1] < TOOLS_CACHE_TTL_SECONDS:
+            self._tools_list = cached[0]
+            self._cache_dirty = False
+            fresh = True
+        else:
+            self.invalidate_tools_cache()
+        tools = await super().list_tools(run_context, agent)
+        if key is not None and not fresh and self._tools_list is not None:
+            _TOOLS_CACHE[key] = (self._tools_list, time.monotonic())
+            logger.info(f"Cached {len(self._tools_list)} tools for MCP server '{self.name}' ({key[2]} {key[3]})")
+        return tools
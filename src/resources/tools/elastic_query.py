@@ -1,7 +1,12 @@
+import asyncio
 import logging
 import os
+import random
+from enum import Enum
+from typing import Any
+
+import aiohttp
 from pydantic import BaseModel, Field
-import requests
 
 from agents.tool import function_tool
 
@@ -12,53 +17,298 @@ load_dotenv()
 
 logger = logging.getLogger(__name__)
 
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("ES_CONNECT_TIMEOUT_SECONDS", "5"))
+REQUEST_TIMEOUT_SECONDS = float(os.getenv("ES_REQUEST_TIMEOUT_SECONDS", "30"))
+POOL_SIZE = int(os.getenv("ES_POOL_SIZE", "10"))
+KEEPALIVE_SECONDS = float(os.getenv("ES_KEEPALIVE_SECONDS", "60"))
+MAX_RETRIES = int(os.getenv("ES_MAX_RETRIES", "3"))
+RETRY_BACKOFF_SECONDS = float(os.getenv("ES_RETRY_BACKOFF_SECONDS", "0.5"))
+RETRY_STATUSES = {429, 500, 502, 503, 504}
+SEARCH_SIZE_DEFAULT = int(os.getenv("ES_SEARCH_SIZE_DEFAULT", "10"))
+SEARCH_SIZE_MAX = int(os.getenv("ES_SEARCH_SIZE_MAX", "100"))
+AGGREGATION_BUCKETS_MAX = int(os.getenv("ES_AGGREGATION_BUCKETS_MAX", "50"))
+
+_session: aiohttp.ClientSession | None = None
+_session_lock = asyncio.Lock()
+
+
 class ElasticQueryParams(BaseModel):
     elastic_index: str = Field(description="the elastic index to search in", default="avatar_hub")
     elastic_query_in_wild_cards: str = Field(description="the elastic query to use to search the index using the wild card elastic syntax")
     user_question: str = Field(description="the user question that is being asked, you should use this to understand the user question and the data you need to return", default="")
+    source_includes: list[str] | None = Field(description="only return these _source fields (wildcards allowed) - like [\"profile.name\", \"labels\", \"is_active\"]; all fields when omitted", default=None)
+    source_excludes: list[str] | None = Field(description="drop these _source fields (wildcards allowed) - like [\"raw_*\"]", default=None)
+    size: int = Field(description=f"the number of hits to return - like 10 (max {SEARCH_SIZE_MAX})", default=SEARCH_SIZE_DEFAULT)
+    sort: list[str] | None = Field(description="sort fields as field:asc|desc - like [\"document_creation_time:desc\"]; required for search_after", default=None)
+    search_after: list[str | int | float] | None = Field(description="the next_search_after value from a previous response, to fetch the next page with the same query and sort", default=None)
+    track_total_hits: bool = Field(description="count all matching documents exactly (slower); otherwise the total is capped at 10000", default=False)
+
+
+class ElasticAggregationType(str, Enum):
+    TERMS = "terms"
+    DATE_HISTOGRAM = "date_histogram"
+    CARDINALITY = "cardinality"
+
+
+class ElasticSubAggregation(BaseModel):
+    type: ElasticAggregationType = Field(description="terms (top values), date_histogram (counts over time) or cardinality (distinct count)")
+    field: str = Field(description="the field to aggregate on; terms/cardinality need a keyword field - like \"labels\" or \"profile.country.keyword\"")
+    size: int = Field(description=f"terms only: number of top buckets (max {AGGREGATION_BUCKETS_MAX})", default=10)
+    calendar_interval: str = Field(description="date_histogram only: minute, hour, day, week, month, quarter or year", default="day")
+
+
+class ElasticAggregation(ElasticSubAggregation):
+    name: str = Field(description="a short name for this aggregation in the result - like \"by_label\"")
+    breakdown: ElasticSubAggregation | None = Field(description="optional aggregation to run inside every bucket of a terms/date_histogram - like a terms breakdown per day", default=None)
+
+
+class ElasticAggregateParams(BaseModel):
+    elastic_index: str = Field(description="the elastic index to search in", default="avatar_hub")
+    elastic_query_in_wild_cards: str = Field(description="the elastic query selecting the documents to count, in the wild card elastic syntax - like is_active: true", default="*")
+    aggregations: list[ElasticAggregation] = Field(description="aggregations to compute; leave empty to only count matching documents", default_factory=list)
+    user_question: str = Field(description="the user question that is being asked, you should use this to understand the user question and the data you need to return", default="")
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared keep-alive session used for every Elasticsearch call."""
+    global _session
+    if _session is not None and not _session.closed:
+        return _session
+    async with _session_lock:
+        if _session is None or _session.closed:
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(limit=POOL_SIZE, keepalive_timeout=KEEPALIVE_SECONDS),
+                timeout=aiohttp.ClientTimeout(total=REQUEST_TIMEOUT_SECONDS, connect=CONNECT_TIMEOUT_SECONDS),
+                headers={"Content-Type": "application/json", "Accept": "application/json"},
+            )
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared session; call once when the process shuts down."""
+    global _session
+    async with _session_lock:
+        if _session is not None:
+            await _session.close()
+            _session = None
+
+
+def _retry_delay(attempt: int, retry_after: str | None) -> float:
+    """Exponential backoff with jitter, honoring a numeric Retry-After header when present."""
+    if retry_after is not None:
+        try:
+            return min(float(retry_after), REQUEST_TIMEOUT_SECONDS)
+        except ValueError:
+            pass
+    return RETRY_BACKOFF_SECONDS * (2 ** attempt) * (0.5 + random.random())
+
+
+async def _elastic_request(index: str, endpoint: str, body: dict[str, Any]) -> dict[str, Any]:
+    """POST body to {ES_URL}/{index}/{endpoint} and return the parsed JSON response.
+
+    Retries connection errors, timeouts and 429/5xx responses with backoff.
+    Raises ValueError with a readable message on configuration, transport or
+    Elasticsearch errors.
+    """
+    elastic_url = os.getenv("ES_URL")
+    if not elastic_url:
+        raise ValueError("error: missing_elastic_url")
+
+    url = f"{elastic_url}/{index}/{endpoint}"
+    headers = {"Authorization": f"ApiKey {os.getenv('ES_API_KEY')}"}
+    logger.info(f"elastic request: {url}")
+    logger.debug(f"body: {body}")
+
+    session = await get_session()
+    for attempt in range(MAX_RETRIES + 1):
+        try:
+            async with session.post(url, headers=headers, json=body) as response:
+                if response.status in RETRY_STATUSES and attempt < MAX_RETRIES:
+                    delay = _retry_delay(attempt, response.headers.get("Retry-After"))
+                    logger.warning(f"elastic returned {response.status}; retrying in {delay:.1f}s")
+                else:
+                    delay = None
+                    try:
+                        payload = await response.json(content_type=None)
+                    except ValueError as exc:
+                        logger.error(f"elastic returned a non-JSON body with status {response.status}: {exc}")
+                        raise ValueError(f"error: elastic_invalid_response: status {response.status}: {exc}")
+            if delay is not None:
+                await asyncio.sleep(delay)
+                continue
+            if response.status >= 400:
+                error = payload.get("error", payload) if isinstance(payload, dict) else payload
+                logger.error(f"elastic error {response.status}: {error}")
+                raise ValueError(f"error: elastic_{response.status}: {error}")
+            logger.info(f"elastic response: status={response.status} took={payload.get('took')}ms")
+            logger.debug(f"response: {payload}")
+            return payload
+        except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as exc:
+            if attempt >= MAX_RETRIES:
+                logger.error(f"error: {exc}")
+                raise ValueError(f"error: elastic_unreachable: {exc}")
+            delay = _retry_delay(attempt, None)
+            logger.warning(f"elastic request failed ({exc!r}); retrying in {delay:.1f}s")
+            await asyncio.sleep(delay)
+    raise ValueError("error: elastic_retries_exhausted")
+
+
+def _build_sort(sort: list[str]) -> list[dict[str, dict[str, str]]]:
+    """Convert ["field:desc", "other"] into Elasticsearch sort clauses."""
+    clauses = []
+    for item in sort:
+        field, _, order = item.partition(":")
+        order = (order or "asc").strip().lower()
+        if order not in ("asc", "desc"):
+            raise ValueError(f"error: invalid_sort_order: {item}")
+        clauses.append({field.strip(): {"order": order}})
+    return clauses
+
+
+def _query_string(query: str) -> dict[str, Any]:
+    return {
+        "query_string": {
+            "query": query,
+            "analyze_wildcard": True,
+            "default_operator": "AND"
+        }
+    }
+
+
+def _build_search_body(params: ElasticQueryParams) -> dict[str, Any]:
+    body: dict[str, Any] = {
+        "size": min(max(params.size, 0), SEARCH_SIZE_MAX),
+        "track_total_hits": True if params.track_total_hits else 10000,
+        "query": _query_string(params.elastic_query_in_wild_cards),
+    }
+    if params.source_includes or params.source_excludes:
+        body["_source"] = {
+            "includes": params.source_includes or [],
+            "excludes": params.source_excludes or [],
+        }
+    if params.sort:
+        body["sort"] = _build_sort(params.sort)
+    if params.search_after:
+        if not params.sort:
+            raise ValueError("error: search_after_requires_sort")
+        body["search_after"] = params.search_after
+    return body
+
+
+def _project_hits(payload: dict[str, Any], size: int) -> dict[str, Any]:
+    """Trim a _search response to the total, the hit sources and the next page's search_after."""
+    hits = payload.get("hits", {})
+    total = hits.get("total")
+    raw_hits = hits.get("hits", [])
+    documents = [{"_id": hit.get("_id"), **(hit.get("_source") or {})} for hit in raw_hits]
+    result: dict[str, Any] = {
+        "total": total.get("value") if isinstance(total, dict) else total,
+        "total_is_lower_bound": isinstance(total, dict) and total.get("relation") == "gte",
+        "returned": len(documents),
+        "hits": documents,
+    }
+    if raw_hits and len(raw_hits) >= size and "sort" in raw_hits[-1]:
+        result["next_search_after"] = raw_hits[-1]["sort"]
+    return result
 
 
 @function_tool
-async def elastic_query_search(elastic_query_params: ElasticQueryParams) -> str:
+async def elastic_query_search(elastic_query_params: ElasticQueryParams) -> dict[str, Any] | str:
     """
-    elastic query search tool - gets you an example row from the chosen table to better understand the data, columns and build.
+    elastic query search tool - returns the matching documents for a query, trimmed to what you ask for.
 
     Args:
         elastic_query_params: The query parameters to fetch the data for.
         should be something like:
-        ElasticQueryParams(elastic_index="avatar_hub", elastic_query_in_wild_cards="is_active: true AND labels: "whatsapp" AND profile_type: "base_profile"", user_question="give me an example for an avatar that is active and has a whatsapp connected profile")
+        ElasticQueryParams(elastic_index="avatar_hub", elastic_query_in_wild_cards="is_active: true AND labels: "whatsapp" AND profile_type: "base_profile"", user_question="give me an example for an avatar that is active and has a whatsapp connected profile", source_includes=["profile.name", "labels"], size=3)
 
-    return the raw json response from the elastic search (contains the elastic raw document)
+    return {"total", "total_is_lower_bound", "returned", "hits": [{"_id", ...selected _source fields}], "next_search_after"}
+    next_search_after is only present when there may be more results and a sort was given;
+    pass it back as search_after (same query and sort) for the next page.
     """
-    elastic_url = os.getenv("ES_URL")
-    if not elastic_url:
-        return "error: missing_elastic_url"
+    try:
+        body = _build_search_body(elastic_query_params)
+        payload = await _elastic_request(elastic_query_params.elastic_index, "_search", body)
+        return _project_hits(payload, body["size"])
+    except ValueError as exc:
+        return str(exc)
 
-    elastic_search_url = f"{elastic_url}/{elastic_query_params.elastic_index}/_search"
-    headers = {
-        "Content-Type": "application/json",
-        "Authorization": f"ApiKey {os.getenv('ES_API_KEY')}",
-        "Accept": "application/json",
-    }
-    body = {
-        "size":1000,
-        "query": {
-            "query_string": {
-                "query": elastic_query_params.elastic_query_in_wild_cards,
-                "analyze_wildcard": True,
-                "default_operator": "AND"
-            }
+
+def _build_aggregation(agg: ElasticSubAggregation) -> dict[str, Any]:
+    if agg.type == ElasticAggregationType.TERMS:
+        return {"terms": {"field": agg.field, "size": min(max(agg.size, 1), AGGREGATION_BUCKETS_MAX)}}
+    if agg.type == ElasticAggregationType.DATE_HISTOGRAM:
+        return {"date_histogram": {"field": agg.field, "calendar_interval": agg.calendar_interval, "min_doc_count": 1}}
+    return {"cardinality": {"field": agg.field}}
+
+
+def _build_aggregations(aggregations: list[ElasticAggregation]) -> dict[str, Any]:
+    aggs: dict[str, Any] = {}
+    for agg in aggregations:
+        clause = _build_aggregation(agg)
+        if agg.breakdown is not None:
+            if agg.type == ElasticAggregationType.CARDINALITY:
+                raise ValueError(f"error: breakdown_not_supported_for_cardinality: {agg.name}")
+            clause["aggs"] = {"breakdown": _build_aggregation(agg.breakdown)}
+        aggs[agg.name] = clause
+    return aggs
+
+
+def _project_aggregation(result: dict[str, Any]) -> dict[str, Any] | int:
+    """Reduce an aggregation result to its value or its [{key, count, breakdown}] buckets."""
+    if "value" in result:
+        return result["value"]
+    buckets = []
+    for bucket in result.get("buckets", []):
+        item: dict[str, Any] = {
+            "key": bucket.get("key_as_string", bucket.get("key")),
+            "count": bucket.get("doc_count"),
         }
-    }
+        if "breakdown" in bucket:
+            item["breakdown"] = _project_aggregation(bucket["breakdown"])
+        buckets.append(item)
+    projected: dict[str, Any] = {"buckets": buckets}
+    if result.get("sum_other_doc_count"):
+        projected["other_count"] = result["sum_other_doc_count"]
+    return projected
+
+
+@function_tool
+async def elastic_aggregate(elastic_aggregate_params: ElasticAggregateParams) -> dict[str, Any] | str:
+    """
+    elastic count/aggregation tool - answers "how many" and "broken down by" questions without fetching documents.
 
-    logger.info(f"elastic_search_url: {elastic_search_url}")
-    logger.info(f"headers: {headers}")
-    logger.info(f"body: {body}")
+    With no aggregations it runs _count. Otherwise it runs a size 0 search with terms (top values),
+    date_histogram (counts over time) and cardinality (distinct count) aggregations and returns only the results.
 
+    Args:
+        elastic_aggregate_params: The query and aggregations to run.
+        should be something like:
+        ElasticAggregateParams(elastic_index="avatar_hub", elastic_query_in_wild_cards="is_active: true AND connected_profiles.whatsapp:*", aggregations=[ElasticAggregation(name="by_label", type="terms", field="labels", size=20)], user_question="how many active avatars have a whatsapp profile, by label")
+
+    return {"count": n} for a plain count, otherwise {"total": n, "aggregations": {name: value | {"buckets": [{"key", "count", "breakdown"}], "other_count"}}}
+    """
+    query = _query_string(elastic_aggregate_params.elastic_query_in_wild_cards)
+    index = elastic_aggregate_params.elastic_index
     try:
-        response = requests.post(elastic_search_url, headers=headers, json=body)
-        logger.info(f"response: {response.json()}")
-        return response.json()
+        if not elastic_aggregate_params.aggregations:
+            payload = await _elastic_request(index, "_count", {"query": query})
+            return {"count": payload.get("count")}
+
+        body = {
+            "size": 0,
+            "track_total_hits": True,
+            "query": query,
+            "aggs": _build_aggregations(elastic_aggregate_params.aggregations),
+        }
+        payload = await _elastic_request(index, "_search", body)
+        total = payload.get("hits", {}).get("total")
+        return {
+            "total": total.get("value") if isinstance(total, dict) else total,
+            "aggregations": {
+                name: _project_aggregation(result)
+                for name, result in payload.get("aggregations", {}).items()
+            },
+        }
     except ValueError as exc:
-        logger.error(f"error: {exc}")
-        return f"error: {exc}"
+        return str(exc)
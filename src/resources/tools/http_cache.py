@@ -0,0 +1,241 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import time
+from collections import OrderedDict
+from email.utils import parsedate_to_datetime
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel
+
+
+logger = logging.getLogger(__name__)
+
+CACHE_ENABLED = os.getenv("HTTP_CACHE_ENABLED", "true").lower() == "true"
+CACHE_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_MAX_ENTRIES", "256"))
+CACHE_MAX_ENTRY_BYTES = int(os.getenv("HTTP_CACHE_MAX_ENTRY_BYTES", str(256 * 1024)))
+CACHE_DIR = os.getenv("HTTP_CACHE_DIR", "")
+CACHE_DISK_MAX_ENTRIES = int(os.getenv("HTTP_CACHE_DISK_MAX_ENTRIES", "2000"))
+
+CACHEABLE_STATUSES = {200, 203, 300, 301, 404, 410}
+# Request headers that steer the cache itself and so must not split entries into variants.
+UNKEYED_REQUEST_HEADERS = {"cache-control", "pragma", "if-none-match", "if-modified-since"}
+
+_MEMORY: OrderedDict[str, "CacheEntry"] = OrderedDict()
+
+
+class CacheEntry(BaseModel):
+    """A stored response plus what is needed to judge freshness and revalidate it."""
+    url: str
+    response: dict[str, Any]
+    stored_at: float
+    max_age: float
+    no_cache: bool = False
+    # Kept in memory only: the response is Cache-Control: private or was fetched with credentials.
+    private: bool = False
+    etag: str | None = None
+    last_modified: str | None = None
+
+    def is_fresh(self) -> bool:
+        return not self.no_cache and time.time() - self.stored_at < self.max_age
+
+    def validators(self) -> dict[str, str]:
+        """Conditional request headers that let the origin answer 304 Not Modified."""
+        headers = {}
+        if self.etag:
+            headers["If-None-Match"] = self.etag
+        if self.last_modified:
+            headers["If-Modified-Since"] = self.last_modified
+        return headers
+
+
+def parse_cache_control(value: str | None) -> dict[str, str | None]:
+    """Parse a Cache-Control header into lower-cased directives, e.g. {'max-age': '60', 'no-cache': None}."""
+    directives: dict[str, str | None] = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') or None
+    return directives
+
+
+def _header(headers: dict[str, Any], name: str) -> str | None:
+    name = name.lower()
+    return next((str(v) for k, v in headers.items() if k.lower() == name), None)
+
+
+def _freshness_lifetime(headers: dict[str, Any], directives: dict[str, str | None]) -> float:
+    """Seconds the response may be served without revalidation (max-age, then Expires - Date, minus Age)."""
+    lifetime = 0.0
+    if (max_age := directives.get("max-age")) is not None:
+        try:
+            lifetime = float(max_age)
+        except ValueError:
+            lifetime = 0.0
+    elif expires := _header(headers, "Expires"):
+        try:
+            date = _header(headers, "Date")
+            origin_now = parsedate_to_datetime(date).timestamp() if date else time.time()
+            lifetime = parsedate_to_datetime(expires).timestamp() - origin_now
+        except (TypeError, ValueError):
+            lifetime = 0.0
+    try:
+        lifetime -= float(_header(headers, "Age") or 0)
+    except ValueError:
+        pass
+    return max(lifetime, 0.0)
+
+
+def request_bypasses_cache(request_headers: dict[str, Any]) -> bool:
+    """True when the caller asked not to use stored responses (no-store)."""
+    return "no-store" in parse_cache_control(_header(request_headers, "Cache-Control"))
+
+
+def request_forces_revalidation(request_headers: dict[str, Any]) -> bool:
+    """True when the caller asked for an origin check even if the stored response is fresh."""
+    directives = parse_cache_control(_header(request_headers, "Cache-Control"))
+    return "no-cache" in directives or directives.get("max-age") == "0"
+
+
+def cache_key(url: str, request_headers: dict[str, Any]) -> str:
+    """Key by URL and request headers, so responses fetched with different credentials never mix.
+
+    The URL hash is the prefix so every variant of a URL can be found for invalidation.
+    """
+    headers = json.dumps(sorted(
+        (str(k).lower(), str(v))
+        for k, v in request_headers.items()
+        if str(k).lower() not in UNKEYED_REQUEST_HEADERS
+    ))
+    return f"{_url_hash(url)}-{hashlib.sha256(headers.encode()).hexdigest()[:16]}"
+
+
+def _url_hash(url: str) -> str:
+    return hashlib.sha256(url.encode()).hexdigest()[:32]
+
+
+def build_entry(
+    url: str,
+    status_code: int,
+    headers: dict[str, Any],
+    response: dict[str, Any],
+    request_headers: dict[str, Any] | None = None,
+) -> CacheEntry | None:
+    """Return a CacheEntry if the response may be stored, else None.
+
+    Storable responses have a cacheable status, no no-store, fit under
+    CACHE_MAX_ENTRY_BYTES, and carry either a freshness lifetime or a validator.
+    Cache-Control: private responses, and responses to requests carrying
+    Authorization that are not marked public, are marked private and never
+    written to disk.
+    """
+    if status_code not in CACHEABLE_STATUSES or response.get("truncated"):
+        return None
+    if response.get("content_length", 0) > CACHE_MAX_ENTRY_BYTES:
+        return None
+    directives = parse_cache_control(_header(headers, "Cache-Control"))
+    if "no-store" in directives:
+        return None
+    entry = CacheEntry(
+        url=url,
+        response=response,
+        stored_at=time.time(),
+        max_age=_freshness_lifetime(headers, directives),
+        no_cache="no-cache" in directives,
+        private="private" in directives or (
+            _header(request_headers or {}, "Authorization") is not None and "public" not in directives
+        ),
+        etag=_header(headers, "ETag"),
+        last_modified=_header(headers, "Last-Modified"),
+    )
+    if entry.max_age <= 0 and not entry.etag and not entry.last_modified:
+        return None
+    return entry
+
+
+def refresh_entry(entry: CacheEntry, not_modified_headers: dict[str, Any]) -> CacheEntry:
+    """Apply the headers of a 304 to a stored entry and restart its freshness clock."""
+    merged_headers = {**entry.response.get("headers", {}), **not_modified_headers}
+    directives = parse_cache_control(_header(merged_headers, "Cache-Control"))
+    return entry.model_copy(update={
+        "response": {**entry.response, "headers": merged_headers},
+        "stored_at": time.time(),
+        "max_age": _freshness_lifetime(not_modified_headers, directives),
+        "no_cache": "no-cache" in directives,
+        "private": entry.private or "private" in directives,
+        "etag": _header(not_modified_headers, "ETag") or entry.etag,
+        "last_modified": _header(not_modified_headers, "Last-Modified") or entry.last_modified,
+    })
+
+
+def _disk_path(key: str) -> Path:
+    return Path(CACHE_DIR) / f"{key}.json"
+
+
+def _read_disk(key: str) -> CacheEntry | None:
+    path = _disk_path(key)
+    try:
+        return CacheEntry.model_validate_json(path.read_text())
+    except FileNotFoundError:
+        return None
+    except Exception as e:
+        logger.warning(f"Dropping unreadable HTTP cache file {path}: {e}")
+        path.unlink(missing_ok=True)
+        return None
+
+
+def _write_disk(key: str, entry: CacheEntry) -> None:
+    directory = Path(CACHE_DIR)
+    directory.mkdir(parents=True, exist_ok=True)
+    tmp = directory / f".{key}.tmp"
+    tmp.write_text(entry.model_dump_json())
+    tmp.replace(_disk_path(key))
+    files = sorted(directory.glob("*.json"), key=lambda p: p.stat().st_mtime)
+    for stale in files[:-CACHE_DISK_MAX_ENTRIES]:
+        stale.unlink(missing_ok=True)
+
+
+def _remove_disk(url: str) -> None:
+    for path in Path(CACHE_DIR).glob(f"{_url_hash(url)}-*.json"):
+        path.unlink(missing_ok=True)
+
+
+async def get_entry(key: str) -> CacheEntry | None:
+    """Look up the memory LRU, then the disk store (promoting disk hits into memory)."""
+    entry = _MEMORY.get(key)
+    if entry is not None:
+        _MEMORY.move_to_end(key)
+        return entry
+    if not CACHE_DIR:
+        return None
+    entry = await asyncio.to_thread(_read_disk, key)
+    if entry is not None:
+        _remember(key, entry)
+    return entry
+
+
+async def put_entry(key: str, entry: CacheEntry) -> None:
+    _remember(key, entry)
+    if CACHE_DIR and not entry.private:
+        try:
+            await asyncio.to_thread(_write_disk, key, entry)
+        except OSError as e:
+            logger.warning(f"Failed to persist HTTP cache entry for {entry.url}: {e}")
+
+
+async def invalidate_url(url: str) -> None:
+    """Drop every stored variant of a URL, e.g. after a POST/PUT/PATCH/DELETE to it."""
+    for key in [k for k, e in _MEMORY.items() if e.url == url]:
+        del _MEMORY[key]
+    if CACHE_DIR:
+        await asyncio.to_thread(_remove_disk, url)
+
+
+def _remember(key: str, entry: CacheEntry) -> None:
+    _MEMORY[key] = entry
+    _MEMORY.move_to_end(key)
+    while len(_MEMORY) > CACHE_MAX_ENTRIES:
+        _MEMORY.popitem(last=False)
@@ -1,7 +1,34 @@
+import asyncio
+import json
+import logging
+import os
 from enum import Enum
+from typing import Any
+
+import aiohttp
 from agents import function_tool
 from pydantic import BaseModel, Field
-import requests
+
+from resources.tools import http_cache
+
+
+logger = logging.getLogger(__name__)
+
+POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "100"))
+POOL_SIZE_PER_HOST = int(os.getenv("HTTP_POOL_SIZE_PER_HOST", "10"))
+KEEPALIVE_SECONDS = float(os.getenv("HTTP_KEEPALIVE_SECONDS", "30"))
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("HTTP_CONNECT_TIMEOUT_SECONDS", "5"))
+READ_TIMEOUT_SECONDS = float(os.getenv("HTTP_READ_TIMEOUT_SECONDS", "30"))
+TOTAL_TIMEOUT_SECONDS = float(os.getenv("HTTP_TOTAL_TIMEOUT_SECONDS", "60"))
+MAX_BODY_BYTES = int(os.getenv("HTTP_MAX_BODY_BYTES", str(1024 * 1024)))
+STREAM_CHUNK_BYTES = 64 * 1024
+UNSAFE_METHODS = {"POST", "PUT", "PATCH", "DELETE"}
+
+TEXT_CONTENT_TYPES = ("text/", "application/xml", "application/javascript", "application/x-www-form-urlencoded")
+
+_session: aiohttp.ClientSession | None = None
+_session_lock = asyncio.Lock()
+
 
 class HttpRequestMethod(str, Enum):
     GET = "GET"
@@ -18,16 +45,153 @@ class HttpRequestParams(BaseModel):
     method: HttpRequestMethod = Field(description="the method of the request, like GET, POST, PUT, DELETE, PATCH, HEAD, OPTIONS", default=HttpRequestMethod.GET)
     headers: dict = Field(description="the headers of the request, like {'Content-Type': 'application/json'}", default={})
     body: dict = Field(description="the body of the request, like {'key': 'value'}", default={})
+    connect_timeout_seconds: float | None = Field(description=f"connect timeout override, default {CONNECT_TIMEOUT_SECONDS}s", default=None)
+    read_timeout_seconds: float | None = Field(description=f"read timeout override (max wait between bytes), default {READ_TIMEOUT_SECONDS}s", default=None)
 
 
 class HttpRequestResponse(BaseModel):
     status_code: int = Field(description="the status code of the response, like 200, 404, 500")
     headers: dict = Field(description="the headers of the response, like {'Content-Type': 'application/json'}")
-    body: dict = Field(description="the body of the response, like {'key': 'value'}")
+    content_type: str | None = Field(description="the media type of the response, like application/json", default=None)
+    body: Any = Field(description="the decoded JSON body, when the response is JSON", default=None)
+    text: str | None = Field(description="the body as text, for text responses or JSON that failed to parse", default=None)
+    content_length: int = Field(description="the number of body bytes read (binary bodies are not returned, only measured)", default=0)
+    truncated: bool = Field(description=f"True when the body exceeded {MAX_BODY_BYTES} bytes and was cut off", default=False)
+    cache_status: str | None = Field(description="hit (served from cache), revalidated (origin answered 304), miss, or None when caching did not apply", default=None)
+
+
+async def get_session() -> aiohttp.ClientSession:
+    """Return the shared keep-alive session (pooled per host) used by http_request."""
+    global _session
+    if _session is not None and not _session.closed:
+        return _session
+    async with _session_lock:
+        if _session is None or _session.closed:
+            _session = aiohttp.ClientSession(
+                connector=aiohttp.TCPConnector(
+                    limit=POOL_SIZE,
+                    limit_per_host=POOL_SIZE_PER_HOST,
+                    keepalive_timeout=KEEPALIVE_SECONDS,
+                ),
+                timeout=aiohttp.ClientTimeout(
+                    total=TOTAL_TIMEOUT_SECONDS,
+                    connect=CONNECT_TIMEOUT_SECONDS,
+                    sock_read=READ_TIMEOUT_SECONDS,
+                ),
+            )
+    return _session
+
+
+async def close_session() -> None:
+    """Close the shared session; call once when the process shuts down."""
+    global _session
+    async with _session_lock:
+        if _session is not None:
+            await _session.close()
+            _session = None
+
+
+async def _read_capped(response: aiohttp.ClientResponse, keep: bool) -> tuple[bytes, int, bool]:
+    """Stream the body in chunks up to MAX_BODY_BYTES.
+
+    Returns (kept bytes, bytes read, truncated). With keep=False the bytes are
+    only counted, and a Content-Length header short-circuits the read entirely.
+    """
+    if not keep and response.content_length is not None:
+        return b"", response.content_length, False
+    chunks: list[bytes] = []
+    size = 0
+    async for chunk in response.content.iter_chunked(STREAM_CHUNK_BYTES):
+        size += len(chunk)
+        if keep:
+            chunks.append(chunk)
+        if size > MAX_BODY_BYTES:
+            return b"".join(chunks)[:MAX_BODY_BYTES], size, True
+    return b"".join(chunks), size, False
+
+
+def _decode_body(
+    content_type: str, charset: str | None, raw: bytes, size: int, truncated: bool
+) -> dict[str, Any]:
+    """Decode a body by media type: JSON is parsed, text is returned, anything else is measured only."""
+    decoded: dict[str, Any] = {"content_length": size, "truncated": truncated}
+    if not raw:
+        return decoded
+    text = raw.decode(charset or "utf-8", errors="replace")
+    if content_type == "application/json" or content_type.endswith("+json"):
+        if not truncated:
+            try:
+                decoded["body"] = json.loads(text)
+                return decoded
+            except ValueError:
+                pass
+        decoded["text"] = text
+    elif not content_type or content_type.startswith(TEXT_CONTENT_TYPES):
+        decoded["text"] = text
+    return decoded
+
+
+def _is_text_like(content_type: str) -> bool:
+    return (
+        content_type == "application/json"
+        or content_type.endswith("+json")
+        or content_type.startswith(TEXT_CONTENT_TYPES)
+        or not content_type
+    )
+
+
+async def _send(params: HttpRequestParams, extra_headers: dict[str, str] | None = None) -> HttpRequestResponse:
+    """Send one request on the shared session and decode the response."""
+    session = await get_session()
+    timeout = None
+    if params.connect_timeout_seconds is not None or params.read_timeout_seconds is not None:
+        timeout = aiohttp.ClientTimeout(
+            total=TOTAL_TIMEOUT_SECONDS,
+            connect=params.connect_timeout_seconds or CONNECT_TIMEOUT_SECONDS,
+            sock_read=params.read_timeout_seconds or READ_TIMEOUT_SECONDS,
+        )
+    async with session.request(
+        params.method.value,
+        params.url,
+        headers={**params.headers, **(extra_headers or {})},
+        json=params.body or None,
+        timeout=timeout,
+    ) as response:
+        content_type = response.content_type if response.headers.get("Content-Type") else ""
+        raw, size, truncated = await _read_capped(response, keep=_is_text_like(content_type))
+        logger.info(f"{params.method.value} {params.url} -> {response.status} ({size} bytes{', truncated' if truncated else ''})")
+        return HttpRequestResponse(
+            status_code=response.status,
+            headers=dict(response.headers),
+            content_type=content_type or None,
+            **_decode_body(content_type, response.charset, raw, size, truncated),
+        )
+
+
+async def _cached_get(params: HttpRequestParams) -> HttpRequestResponse:
+    """GET through the HTTP cache: serve fresh entries, revalidate stale ones with a conditional request."""
+    key = http_cache.cache_key(params.url, params.headers)
+    entry = await http_cache.get_entry(key)
+    if entry is not None and entry.is_fresh() and not http_cache.request_forces_revalidation(params.headers):
+        logger.info(f"GET {params.url} served from cache")
+        return HttpRequestResponse(**entry.response, cache_status="hit")
+
+    response = await _send(params, entry.validators() if entry is not None else None)
+    if response.status_code == 304 and entry is not None:
+        entry = http_cache.refresh_entry(entry, response.headers)
+        await http_cache.put_entry(key, entry)
+        return HttpRequestResponse(**entry.response, cache_status="revalidated")
 
+    new_entry = http_cache.build_entry(
+        params.url, response.status_code, response.headers, response.model_dump(exclude={"cache_status"}), params.headers
+    )
+    if new_entry is not None:
+        await http_cache.put_entry(key, new_entry)
+    response.cache_status = "miss"
+    return response
 
 
-@function_tool
+@function_tool(strict_mode=False)
 async def http_request(http_request_params: HttpRequestParams) -> HttpRequestResponse:
     """
     http request tool - makes an http request to the given url with the given method, headers and body.
@@ -37,10 +201,25 @@ async def http_request(http_request_params: HttpRequestParams) -> HttpRequestRes
         should be something like:
         HttpRequestParams(url="https://api.github.com", method="GET", headers={"Content-Type": "application/json"}, body={"key": "value"})
 
-    return the raw json response from the http request
+    return the status, headers and body: parsed JSON in body, text responses in text, and only the
+    size of binary responses (content_length). Bodies over the size cap are cut off and marked truncated.
+    GET responses are cached per Cache-Control/ETag/Last-Modified (cache_status tells whether the origin was hit);
+    send a 'Cache-Control: no-cache' header to force a check with the origin.
     """
     try:
-        response = requests.request(http_request_params.method, http_request_params.url, headers=http_request_params.headers, json=http_request_params.body)
-        return HttpRequestResponse(status_code=response.status_code, headers=dict(response.headers), body=response.json())
+        params = http_request_params
+        if (
+            http_cache.CACHE_ENABLED
+            and params.method == HttpRequestMethod.GET
+            and not params.body
+            and not http_cache.request_bypasses_cache(params.headers)
+        ):
+            return await _cached_get(params)
+        response = await _send(params)
+        if params.method.value in UNSAFE_METHODS and response.status_code < 400:
+            await http_cache.invalidate_url(params.url)
+        return response
+    except asyncio.TimeoutError:
+        return HttpRequestResponse(status_code=504, headers={}, body={"error": "timeout"})
     except Exception as e:
-        return HttpRequestResponse(status_code=500, headers={}, body={"error": str(e)})
\ No newline at end of file
+        return HttpRequestResponse(status_code=500, headers={}, body={"error": str(e)})
@@ -1,11 +1,29 @@
+import asyncio
 import logging
+import math
+import os
+import re
 import sys
+from datetime import datetime, timezone
+from typing import Any, TypedDict
+
 from agents.tool import function_tool
 
-from kubernetes_asyncio import client, config
+from kubernetes_asyncio import client, watch
 from kubernetes_asyncio.client.exceptions import ApiException
 from pydantic import BaseModel, Field
 
+from resources.tools.k8s_client import get_api_client
+from resources.tools.k8s_informer import (
+    EVENTS_BUFFER_SIZE,
+    deployments_informer,
+    event_sort_key,
+    events_collector,
+    namespaces_informer,
+    pods_informer,
+)
+from resources.tools.log_reducer import reduce_log_lines, timestamp_sort_key
+
 
 logging.basicConfig(
     stream=sys.stdout,
@@ -14,6 +32,17 @@ logging.basicConfig(
 )
 logger = logging.getLogger(__name__)
 
+LOG_FETCH_CONCURRENCY = int(os.getenv("K8S_LOG_FETCH_CONCURRENCY", "8"))
+DEPLOYMENT_LOG_TAIL_LINES = int(os.getenv("K8S_DEPLOYMENT_LOG_TAIL_LINES", "200"))
+LOG_FOLLOW_MAX_SECONDS = int(os.getenv("K8S_LOG_FOLLOW_MAX_SECONDS", "60"))
+LOG_FOLLOW_MAX_LINES = int(os.getenv("K8S_LOG_FOLLOW_MAX_LINES", "1000"))
+ROLLOUT_WAIT_TIMEOUT_SECONDS = int(os.getenv("K8S_ROLLOUT_WAIT_TIMEOUT_SECONDS", "120"))
+ROLLOUT_WAIT_MAX_SECONDS = int(os.getenv("K8S_ROLLOUT_WAIT_MAX_SECONDS", "600"))
+METRICS_ENABLED = os.getenv("K8S_METRICS_ENABLED", "true").lower() in ("1", "true", "yes")
+
+# (namespace, pod, container) -> timestamp of the newest log line already returned
+_LOG_CURSORS: dict[tuple[str, str, str], str] = {}
+
 
 class BaseK8SData(BaseModel):
     namespace: str = Field(description="Kubernetes namespace")
@@ -28,31 +57,37 @@ class BaseK8SPod(BaseK8SData):
 
 
 async def _get_all_namespaces() -> list[str]:
-    """Return all namespaces as BaseK8SData objects."""
-    await config.load_kube_config()
-    async with client.ApiClient() as api_client:
-        core = client.CoreV1Api(api_client)
-        try:
+    """Return all namespaces, from the informer cache when it is fresh."""
+    informer = namespaces_informer()
+    api_client = await get_api_client()
+    core = client.CoreV1Api(api_client)
+    try:
+        if informer.is_fresh():
+            names = informer.names()
+        else:
             namespaces = await core.list_namespace()
             names = [
                 item.metadata.name
                 for item in namespaces.items
                 if item.metadata is not None and item.metadata.name is not None
             ]
-            logger.info(f"Found {len(names)} namespaces in cluster")
-            if not names:
-                error_message = "No namespaces found in cluster"
-                logger.warning(error_message)
-                raise ValueError(error_message)
-            return names
-        except ApiException as exc:
-            error_message = f"Failed to list namespaces: {exc}"
-            logger.exception(error_message)
+        logger.info(f"Found {len(names)} namespaces in cluster")
+        if not names:
+            error_message = "No namespaces found in cluster"
+            logger.warning(error_message)
             raise ValueError(error_message)
+        return names
+    except ApiException as exc:
+        error_message = f"Failed to list namespaces: {exc}"
+        logger.exception(error_message)
+        raise ValueError(error_message)
 
 
 async def _validate_namespace(namespace: str) -> bool:
     """Return True if the namespace exists in the cluster."""
+    informer = namespaces_informer()
+    if informer.is_fresh():
+        return namespace in informer
     namespaces = await _get_all_namespaces()
     return any(namespace == ns for ns in namespaces)
 
@@ -64,22 +99,25 @@ async def _get_all_deployments(namespace: str) -> list[str]:
         logger.warning(error_message)
         raise ValueError(error_message)
     
-    await config.load_kube_config()
-    async with client.ApiClient() as api_client:
-        apps = client.AppsV1Api(api_client)
-        try:
-            deployments = await apps.list_namespaced_deployment(namespace=namespace)
-            names = [
-                item.metadata.name
-                for item in deployments.items
-                if item.metadata is not None and item.metadata.name is not None
-            ]
-            logger.info(f"Found {len(names)} deployments in namespace '{namespace}'")
-            return names
-        except ApiException as exc:
-            error_message = f"Failed to list deployments in namespace '{namespace}': {exc}"
-            logger.exception(error_message)
-            raise ValueError(error_message)
+    informer = deployments_informer(namespace)
+    if informer.is_fresh():
+        return informer.names()
+
+    api_client = await get_api_client()
+    apps = client.AppsV1Api(api_client)
+    try:
+        deployments = await apps.list_namespaced_deployment(namespace=namespace)
+        names = [
+            item.metadata.name
+            for item in deployments.items
+            if item.metadata is not None and item.metadata.name is not None
+        ]
+        logger.info(f"Found {len(names)} deployments in namespace '{namespace}'")
+        return names
+    except ApiException as exc:
+        error_message = f"Failed to list deployments in namespace '{namespace}': {exc}"
+        logger.exception(error_message)
+        raise ValueError(error_message)
 
 
 async def _validate_deployment(deployment: str, namespace: str) -> bool:
@@ -96,6 +134,12 @@ def _build_label_selector(match_labels: dict[str, str]) -> str:
     return ",".join(f"{k}={v}" for k, v in match_labels.items()) if match_labels else ""
 
 
+def _matches_labels(match_labels: dict[str, str], labels: dict[str, str] | None) -> bool:
+    """Return True if labels satisfy every key=value pair in match_labels (in-memory label_selector)."""
+    labels = labels or {}
+    return all(labels.get(k) == v for k, v in match_labels.items())
+
+
 @function_tool
 async def get_all_namespaces() -> list[str] | str:
     """Get all namespaces in the current cluster.
@@ -143,40 +187,121 @@ async def get_deployment_status(base_k8s_data: BaseK8SDeployment) -> dict[str, o
         dict[str, object] | str: A structured status dict, or an error message.
     """
     try:
-        await config.load_kube_config()
-        async with client.ApiClient() as api_client:
-            apps = client.AppsV1Api(api_client)
-            try:
-                resp = await apps.read_namespaced_deployment_status(
-                    name=base_k8s_data.deployment, namespace=base_k8s_data.namespace
-                )
-            except ApiException as exc:
-                msg = (
-                    f"Failed to read deployment status for '{base_k8s_data.deployment}' "
-                    f"in namespace '{base_k8s_data.namespace}': {exc}"
-                )
-                logger.exception(msg)
-                return msg
-
-            status = getattr(resp, "status", None)
-            if status is None:
-                return "error: missing_deployment_status"
-
-            result: dict[str, object] = {
-                "namespace": base_k8s_data.namespace,
-                "deployment": base_k8s_data.deployment,
-                "replicas": getattr(status, "replicas", 0) or 0,
-                "ready_replicas": getattr(status, "ready_replicas", 0) or 0,
-                "updated_replicas": getattr(status, "updated_replicas", 0) or 0,
-                "available_replicas": getattr(status, "available_replicas", 0) or 0,
-                "unavailable_replicas": getattr(status, "unavailable_replicas", 0) or 0,
-            }
-            return result
+        api_client = await get_api_client()
+        apps = client.AppsV1Api(api_client)
+        try:
+            resp = await apps.read_namespaced_deployment_status(
+                name=base_k8s_data.deployment, namespace=base_k8s_data.namespace
+            )
+        except ApiException as exc:
+            msg = (
+                f"Failed to read deployment status for '{base_k8s_data.deployment}' "
+                f"in namespace '{base_k8s_data.namespace}': {exc}"
+            )
+            logger.exception(msg)
+            return msg
+
+        status = getattr(resp, "status", None)
+        if status is None:
+            return "error: missing_deployment_status"
+
+        result: dict[str, object] = {
+            "namespace": base_k8s_data.namespace,
+            "deployment": base_k8s_data.deployment,
+            "replicas": getattr(status, "replicas", 0) or 0,
+            "ready_replicas": getattr(status, "ready_replicas", 0) or 0,
+            "updated_replicas": getattr(status, "updated_replicas", 0) or 0,
+            "available_replicas": getattr(status, "available_replicas", 0) or 0,
+            "unavailable_replicas": getattr(status, "unavailable_replicas", 0) or 0,
+        }
+        return result
     except Exception as e:
         logger.exception(f"An unexpected error occurred: {e}")
         return str(e)
 
 
+async def _get_deployment_pods(namespace: str, deployment: str) -> list[Any]:
+    """Return the Pod objects selected by a Deployment's match_labels.
+
+    Reads from the informer caches when fresh, otherwise from the API.
+    Raises ValueError with a readable message on failure.
+    """
+    api_client = await get_api_client()
+    apps = client.AppsV1Api(api_client)
+    core = client.CoreV1Api(api_client)
+
+    # 1) Read the deployment (from the informer cache when fresh); if it doesn't exist, return an error
+    dep = None
+    if await _validate_namespace(namespace):
+        dep_informer = deployments_informer(namespace)
+        if dep_informer.is_fresh():
+            dep = dep_informer.get(deployment)
+    if dep is None:
+        try:
+            dep = await apps.read_namespaced_deployment(name=deployment, namespace=namespace)
+        except ApiException as exc:
+            msg = f"Failed to read deployment '{deployment}' in namespace '{namespace}': {exc}"
+            logger.exception(msg)
+            raise ValueError(msg)
+
+    # 2) Build a simple label selector from match_labels only
+    match_labels = (
+        getattr(getattr(getattr(dep, "spec", None), "selector", None), "match_labels", None)
+        or {}
+    )
+    if not match_labels:
+        msg = f"Deployment '{deployment}' has no match_labels selector; cannot list pods"
+        logger.warning(msg)
+        raise ValueError(msg)
+
+    # 3) List pods using the computed label selector, from the informer cache when fresh
+    pod_informer = pods_informer(namespace)
+    if pod_informer.is_fresh():
+        pods = [
+            p
+            for p in pod_informer.items()
+            if p.metadata is not None and _matches_labels(match_labels, p.metadata.labels)
+        ]
+        logger.info(f"Deployment '{deployment}' has {len(pods)} pods in namespace '{namespace}' (cached)")
+        return pods
+
+    try:
+        resp = await core.list_namespaced_pod(
+            namespace=namespace, label_selector=_build_label_selector(match_labels)
+        )
+    except ApiException as exc:
+        msg = f"Failed to list pods for deployment '{deployment}' in namespace '{namespace}': {exc}"
+        logger.exception(msg)
+        raise ValueError(msg)
+    pods = [p for p in resp.items if p.metadata is not None and p.metadata.name is not None]
+    logger.info(f"Deployment '{deployment}' has {len(pods)} pods in namespace '{namespace}'")
+    return pods
+
+
+def _use_previous_logs(pod: Any, container_name: str) -> bool:
+    """Return True if the container restarted or is in CrashLoopBackOff, so the previous instance's logs matter."""
+    statuses = getattr(getattr(pod, "status", None), "container_statuses", None) or []
+    for s in statuses:
+        if getattr(s, "name", None) != container_name:
+            continue
+        restart_count = getattr(s, "restart_count", 0) or 0
+        waiting = getattr(getattr(s, "state", None), "waiting", None)
+        # Use previous logs if we have restarts or CrashLoopBackOff
+        if restart_count > 0:
+            return True
+        if waiting is not None and getattr(waiting, "reason", "") == "CrashLoopBackOff":
+            return True
+    return False
+
+
+def _split_log_timestamp(line: str) -> tuple[str, str]:
+    """Split a timestamps=True log line into (RFC3339 timestamp, message)."""
+    timestamp, sep, message = line.partition(" ")
+    if not sep or not timestamp[:1].isdigit():
+        return "", line
+    return timestamp, message
+
+
 @function_tool
 async def get_pods_per_deployment(base_k8s_data: BaseK8SDeployment) -> list[str] | str:
     """Get pod names under a Deployment using its match_labels selector only.
@@ -190,51 +315,10 @@ async def get_pods_per_deployment(base_k8s_data: BaseK8SDeployment) -> list[str]
         list[str] | str
     """
     try:
-        await config.load_kube_config()
-        async with client.ApiClient() as api_client:
-            apps = client.AppsV1Api(api_client)
-            core = client.CoreV1Api(api_client)
-
-            # 1) Read the deployment; if it doesn't exist, return an error
-            try:
-                dep = await apps.read_namespaced_deployment(
-                    name=base_k8s_data.deployment, namespace=base_k8s_data.namespace
-                )
-            except ApiException as exc:
-                msg = f"Failed to read deployment '{base_k8s_data.deployment}' in namespace '{base_k8s_data.namespace}': {exc}"
-                logger.exception(msg)
-                return msg
-
-            # 2) Build a simple label selector from match_labels only
-            match_labels = (
-                getattr(getattr(getattr(dep, "spec", None), "selector", None), "match_labels", None)
-                or {}
-            )
-            if not match_labels:
-                msg = f"Deployment '{base_k8s_data.deployment}' has no match_labels selector; cannot list pods"
-                logger.warning(msg)
-                return msg
-
-            label_selector = _build_label_selector(match_labels)
-
-            # 3) List pods using the computed label selector
-            try:
-                pods = await core.list_namespaced_pod(
-                    namespace=base_k8s_data.namespace, label_selector=label_selector
-                )
-                results = [
-                    p.metadata.name
-                    for p in pods.items
-                    if p.metadata is not None and p.metadata.name is not None
-                ]
-                logger.info(
-                    f"Deployment '{base_k8s_data.deployment}' has {len(results)} pods in namespace '{base_k8s_data.namespace}'"
-                )
-                return results
-            except ApiException as exc:
-                msg = f"Failed to list pods for deployment '{base_k8s_data.deployment}' in namespace '{base_k8s_data.namespace}': {exc}"
-                logger.exception(msg)
-                return msg
+        pods = await _get_deployment_pods(base_k8s_data.namespace, base_k8s_data.deployment)
+        return [p.metadata.name for p in pods]
+    except ValueError as e:
+        return str(e)
     except Exception as e:
         logger.exception(f"An unexpected error occurred: {e}")
         return str(e)
@@ -244,17 +328,25 @@ async def get_pods_per_deployment(base_k8s_data: BaseK8SDeployment) -> list[str]
 async def set_deployment_replicas(
     base_k8s_data: BaseK8SDeployment,
     replicas: int,
-) -> bool | str:
+    wait_for_ready: bool = False,
+    timeout_seconds: int = ROLLOUT_WAIT_TIMEOUT_SECONDS,
+) -> bool | dict[str, object] | str:
     """Set the desired number of replicas for a Deployment.
 
     Args:
         base_k8s_data: Input containing namespace and deployment.
         replicas: Desired replica count.
+        wait_for_ready: Watch the Deployment after scaling until ready/available replicas
+            match the target (or timeout_seconds passes) and return the status timeline.
+            Use this instead of polling get_deployment_status.
+        timeout_seconds: Maximum time to wait when wait_for_ready is set (capped by
+            K8S_ROLLOUT_WAIT_MAX_SECONDS).
         should be something like:
         BaseK8SDeployment(namespace="enrichment", deployment="web"), replicas=3
 
     Returns:
-        bool | str
+        bool | dict[str, object] | str: True/False without waiting; with wait_for_ready,
+        a dict with ready, elapsed_seconds and timeline.
     """
     try:
         if not await _validate_namespace(base_k8s_data.namespace):
@@ -267,28 +359,176 @@ async def set_deployment_replicas(
             logger.warning(error_message)
             return error_message
 
-        await config.load_kube_config()
-        async with client.ApiClient() as api_client:
-            apps = client.AppsV1Api(api_client)
-            try:
-                body = {"spec": {"replicas": replicas}}
-                await apps.patch_namespaced_deployment_scale(
-                    name=base_k8s_data.deployment, namespace=base_k8s_data.namespace, body=body
-                )
-                logger.info(f"Scaled deployment '{base_k8s_data.deployment}' to {replicas} replicas in namespace '{base_k8s_data.namespace}'")
-                return True
-            except ApiException as exc:
-                logger.exception(f"Failed to scale deployment '{base_k8s_data.deployment}' in namespace '{base_k8s_data.namespace}' to {replicas}: {exc}")
-                return False
+        api_client = await get_api_client()
+        apps = client.AppsV1Api(api_client)
+        try:
+            body = {"spec": {"replicas": replicas}}
+            await apps.patch_namespaced_deployment_scale(
+                name=base_k8s_data.deployment, namespace=base_k8s_data.namespace, body=body
+            )
+            logger.info(f"Scaled deployment '{base_k8s_data.deployment}' to {replicas} replicas in namespace '{base_k8s_data.namespace}'")
+        except ApiException as exc:
+            logger.exception(f"Failed to scale deployment '{base_k8s_data.deployment}' in namespace '{base_k8s_data.namespace}' to {replicas}: {exc}")
+            return False
+
+        if not wait_for_ready:
+            return True
+        return await _wait_for_replicas(
+            apps,
+            base_k8s_data.namespace,
+            base_k8s_data.deployment,
+            replicas,
+            max(1, min(timeout_seconds, ROLLOUT_WAIT_MAX_SECONDS)),
+        )
     except Exception as e:
         logger.exception(f"An unexpected error occurred: {e}")
         return str(e)
 
 
+def _rollout_snapshot(dep: Any) -> dict[str, object]:
+    status = dep.status
+    return {
+        "replicas": status.replicas or 0,
+        "updated": status.updated_replicas or 0,
+        "ready": status.ready_replicas or 0,
+        "available": status.available_replicas or 0,
+        "unavailable": status.unavailable_replicas or 0,
+    }
+
+
+def _rollout_done(dep: Any, target: int) -> bool:
+    """Return True once the controller has observed the change and every replica is ready and available."""
+    status = dep.status
+    if (status.observed_generation or 0) < (dep.metadata.generation or 0):
+        return False
+    return (
+        (status.replicas or 0) == target
+        and (status.updated_replicas or 0) == target
+        and (status.ready_replicas or 0) == target
+        and (status.available_replicas or 0) == target
+    )
+
+
+async def _wait_for_replicas(
+    apps: client.AppsV1Api, namespace: str, deployment: str, target: int, timeout_seconds: int
+) -> dict[str, object]:
+    """Watch one Deployment until its replicas converge on target or the timeout passes.
+
+    Records a timeline entry every time the replica counts change, so the caller
+    sees how the rollout progressed without polling.
+    """
+    loop = asyncio.get_running_loop()
+    started = loop.time()
+    timeline: list[dict[str, object]] = []
+    last_snapshot: dict[str, object] | None = None
+    done = False
+    try:
+        async with asyncio.timeout(timeout_seconds):
+            async with watch.Watch() as w:
+                async for event in w.stream(
+                    apps.list_namespaced_deployment,
+                    namespace=namespace,
+                    field_selector=f"metadata.name={deployment}",
+                    timeout_seconds=timeout_seconds,
+                ):
+                    dep = event["object"]
+                    snapshot = _rollout_snapshot(dep)
+                    if snapshot != last_snapshot:
+                        timeline.append({"t": round(loop.time() - started, 1), **snapshot})
+                        last_snapshot = snapshot
+                    if event["type"] == "DELETED":
+                        break
+                    if _rollout_done(dep, target):
+                        done = True
+                        break
+    except TimeoutError:
+        pass
+
+    elapsed = round(loop.time() - started, 1)
+    logger.info(
+        f"Deployment '{deployment}' in namespace '{namespace}' "
+        f"{'reached' if done else 'did not reach'} {target} ready replicas after {elapsed}s"
+    )
+    return {
+        "namespace": namespace,
+        "deployment": deployment,
+        "target_replicas": target,
+        "ready": done,
+        "elapsed_seconds": elapsed,
+        "timeline": timeline,
+    }
+
+
+async def _resolve_pod_container(namespace: str, pod_name: str, container_name: str | None) -> tuple[Any, str]:
+    """Return (pod, container name), defaulting to the only container when none is given.
+
+    Raises ValueError with a readable message when the namespace, pod or container can't be resolved.
+    """
+    if not await _validate_namespace(namespace):
+        error_message = f"Namespace '{namespace}' does not exist; returning empty pods list"
+        logger.warning(error_message)
+        raise ValueError(error_message)
+
+    pod_informer = pods_informer(namespace)
+    pod = pod_informer.get(pod_name) if pod_informer.is_fresh() else None
+    if pod is None:
+        api_client = await get_api_client()
+        core = client.CoreV1Api(api_client)
+        try:
+            pod = await core.read_namespaced_pod(name=pod_name, namespace=namespace)
+        except ApiException as exc:
+            error_message = f"Failed to read pod '{pod_name}' in namespace '{namespace}': {exc}"
+            logger.exception(error_message)
+            raise ValueError(error_message)
+
+    containers = [c.name for c in getattr(getattr(pod, "spec", None), "containers", None) or []]
+    if container_name is None and len(containers) == 1:
+        return pod, containers[0]
+    if container_name is None or container_name not in containers:
+        logger.warning(f"Pod '{pod_name}' in namespace '{namespace}' has containers {containers}; specify container_name")
+        raise ValueError(f"Pod '{pod_name}' has containers {containers}; specify container_name")
+    return pod, container_name
+
+
+def _since_seconds(cursor: str) -> int:
+    """Return a since_seconds value that covers everything after the cursor timestamp (plus one second of slack)."""
+    elapsed = (datetime.now(timezone.utc) - datetime.fromisoformat(cursor)).total_seconds()
+    return max(1, math.ceil(elapsed) + 1)
+
+
+def _lines_after_cursor(lines: list[str], cursor: str | None) -> list[str]:
+    """Drop lines at or before the cursor; since_seconds has one-second granularity, so the API overlaps."""
+    if cursor is None:
+        return lines
+    cursor_key = timestamp_sort_key(cursor)
+    return [
+        line for line in lines
+        if timestamp_sort_key(_split_log_timestamp(line)[0] or cursor) > cursor_key
+    ]
+
+
+def _advance_log_cursor(key: tuple[str, str, str], lines: list[str]) -> None:
+    """Remember the newest timestamp seen for a (namespace, pod, container)."""
+    for line in reversed(lines):
+        timestamp, _ = _split_log_timestamp(line)
+        if timestamp:
+            _LOG_CURSORS[key] = timestamp
+            return
+
+
+def _render_logs(lines: list[str], raw: bool) -> str:
+    if raw or not lines:
+        return "\n".join(lines)
+    return reduce_log_lines(lines).render()
+
+
 @function_tool
 async def get_pod_logs(
     base_k8s_data: BaseK8SPod,
     previous: bool | None = None,
+    container_name: str | None = None,
+    raw: bool = False,
+    only_new: bool = False,
 ) -> str | str:
     """Return logs for a Pod container.
 
@@ -298,6 +538,10 @@ async def get_pod_logs(
     Args:
         base_k8s_data: Input containing namespace and pod name.
         previous: Force returning previous logs; when None, auto-detect.
+        container_name: Required only when the pod has more than one container.
+        raw: Return the raw lines instead of the reduced summary.
+        only_new: Return only lines logged since the last call for this pod/container
+            (current container instance; previous is not auto-detected).
         should be something like:
         BaseK8SPod(namespace="enrichment", pod="web-abc-123")
 
@@ -305,68 +549,764 @@ async def get_pod_logs(
         str | str
 
     Notes:
-        Returns the last 1000 log lines (tail_lines=1000) with timestamps.
+        Reads the last 1000 log lines (tail_lines=1000) with timestamps. Unless raw=True
+        they are reduced to templates with counts, first/last seen and verbatim error
+        lines; the raw lines stay available through get_raw_log_lines(log_id).
     """
     try:
-        if not await _validate_namespace(base_k8s_data.namespace):
-            error_message = f"Namespace '{base_k8s_data.namespace}' does not exist; returning empty pods list"
-            logger.warning(error_message)
-            return error_message
+        pod, container_name = await _resolve_pod_container(
+            base_k8s_data.namespace, base_k8s_data.pod, container_name
+        )
 
-        await config.load_kube_config()
-        async with client.ApiClient() as api_client:
-            core = client.CoreV1Api(api_client)
-            try:
-                pod = await core.read_namespaced_pod(name=base_k8s_data.pod, namespace=base_k8s_data.namespace)
-            except ApiException as exc:
-                logger.exception(f"Failed to read pod '{base_k8s_data.pod}' in namespace '{base_k8s_data.namespace}': {exc}")
-                return ""
-
-            containers = getattr(getattr(pod, "spec", None), "containers", None) or []
-            if len(containers) == 1:
-                container_name = containers[0].name
-            else:
-                logger.warning(f"Pod '{base_k8s_data.pod}' in namespace '{base_k8s_data.namespace}' has multiple containers; specify container_name")
-                return ""
+        # Auto-detect whether to use previous logs
+        if previous is not None:
+            prev_flag = previous
+        else:
+            prev_flag = False if only_new else _use_previous_logs(pod, container_name)
 
-            # Auto-detect whether to use previous logs
-            prev_flag = False
-            if previous is not None:
-                prev_flag = previous
-            else:
-                statuses = (
-                    getattr(getattr(pod, "status", None), "container_statuses", None)
-                    or []
-                )
-                status_for_container = None
-                for s in statuses:
-                    if getattr(s, "name", None) == container_name:
-                        status_for_container = s
-                        break
+        cursor_key = (base_k8s_data.namespace, base_k8s_data.pod, container_name)
+        cursor = _LOG_CURSORS.get(cursor_key) if only_new and not prev_flag else None
 
-                if status_for_container is not None:
-                    restart_count = getattr(status_for_container, "restart_count", 0) or 0
-                    state = getattr(status_for_container, "state", None)
-                    waiting = getattr(state, "waiting", None)
-                    # Use previous logs if we have restarts or CrashLoopBackOff
-                    if restart_count > 0:
-                        prev_flag = True
-                    elif waiting is not None and getattr(waiting, "reason", "") == "CrashLoopBackOff":
-                        prev_flag = True
+        api_client = await get_api_client()
+        core = client.CoreV1Api(api_client)
+        try:
+            logs = await core.read_namespaced_pod_log(
+                name=base_k8s_data.pod,
+                namespace=base_k8s_data.namespace,
+                container=container_name,
+                previous=prev_flag,
+                timestamps=True,
+                tail_lines=1000,
+                **({"since_seconds": _since_seconds(cursor)} if cursor else {}),
+            )
+        except ApiException as exc:
+            logger.exception(f"Failed to read logs for pod '{base_k8s_data.pod}' (container '{container_name}') in namespace '{base_k8s_data.namespace}': {exc}")
+            return ""
 
-            try:
+        lines = _lines_after_cursor((logs or "").splitlines(), cursor)
+        if not prev_flag:
+            _advance_log_cursor(cursor_key, lines)
+        if only_new and not lines:
+            return f"No new log lines since {cursor}" if cursor else ""
+        return _render_logs(lines, raw)
+    except ValueError as e:
+        return str(e)
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred: {e}")
+        return str(e)
+
+
+@function_tool
+async def follow_pod_logs(
+    base_k8s_data: BaseK8SPod,
+    container_name: str | None = None,
+    max_seconds: int = 30,
+    max_lines: int = LOG_FOLLOW_MAX_LINES,
+    raw: bool = False,
+) -> str:
+    """Stream live logs from a Pod container until a time or line budget is spent.
+
+    Starts right after the last line returned for this pod/container by a previous
+    get_pod_logs/follow_pod_logs call, or from now when there is none.
+
+    Args:
+        base_k8s_data: Input containing namespace and pod name.
+        container_name: Required only when the pod has more than one container.
+        max_seconds: Stop streaming after this many seconds (capped by K8S_LOG_FOLLOW_MAX_SECONDS).
+        max_lines: Stop streaming after this many lines (capped by K8S_LOG_FOLLOW_MAX_LINES).
+        raw: Return the raw lines instead of the reduced summary.
+        should be something like:
+        BaseK8SPod(namespace="enrichment", pod="web-abc-123"), max_seconds=30
+
+    Returns:
+        str: The streamed lines or their summary.
+    """
+    try:
+        _, container_name = await _resolve_pod_container(
+            base_k8s_data.namespace, base_k8s_data.pod, container_name
+        )
+        max_seconds = max(1, min(max_seconds, LOG_FOLLOW_MAX_SECONDS))
+        max_lines = max(1, min(max_lines, LOG_FOLLOW_MAX_LINES))
+        cursor_key = (base_k8s_data.namespace, base_k8s_data.pod, container_name)
+        cursor = _LOG_CURSORS.get(cursor_key)
+
+        api_client = await get_api_client()
+        core = client.CoreV1Api(api_client)
+        try:
+            resp = await core.read_namespaced_pod_log(
+                name=base_k8s_data.pod,
+                namespace=base_k8s_data.namespace,
+                container=container_name,
+                follow=True,
+                timestamps=True,
+                _preload_content=False,
+                **({"since_seconds": _since_seconds(cursor)} if cursor else {"tail_lines": 0}),
+            )
+        except ApiException as exc:
+            logger.exception(f"Failed to follow logs for pod '{base_k8s_data.pod}' (container '{container_name}') in namespace '{base_k8s_data.namespace}': {exc}")
+            return str(exc)
+
+        lines: list[str] = []
+        loop = asyncio.get_running_loop()
+        deadline = loop.time() + max_seconds
+        stop_reason = "time budget spent"
+        try:
+            while True:
+                if len(lines) >= max_lines:
+                    stop_reason = "line budget spent"
+                    break
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    chunk = await asyncio.wait_for(resp.content.readline(), timeout=remaining)
+                except asyncio.TimeoutError:
+                    break
+                if not chunk:
+                    stop_reason = "log stream ended"
+                    break
+                lines.extend(_lines_after_cursor([chunk.decode("utf-8", errors="replace").rstrip("\n")], cursor))
+        finally:
+            resp.release()
+
+        _advance_log_cursor(cursor_key, lines)
+        logger.info(f"Followed {len(lines)} log lines from pod '{base_k8s_data.pod}' (container '{container_name}'): {stop_reason}")
+        header = f"Followed {len(lines)} lines ({stop_reason})"
+        return f"{header}\n{_render_logs(lines, raw)}" if lines else header
+    except ValueError as e:
+        return str(e)
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred: {e}")
+        return str(e)
+
+
+@function_tool
+async def get_deployment_logs(
+    base_k8s_data: BaseK8SDeployment,
+    tail_lines: int = DEPLOYMENT_LOG_TAIL_LINES,
+    previous: bool | None = None,
+    raw: bool = False,
+) -> str:
+    """Return one merged log view for every pod and container of a Deployment.
+
+    Logs are fetched concurrently (at most K8S_LOG_FETCH_CONCURRENCY requests in
+    flight), interleaved by timestamp, and deduplicated on (timestamp, message);
+    untimestamped lines are never dropped. Each line is prefixed with its source
+    as [pod/container]. Unless raw=True the merged view is reduced to templates
+    (see get_pod_logs).
+
+    Args:
+        base_k8s_data: Input containing namespace and deployment.
+        tail_lines: Lines to fetch per container.
+        previous: Force previous (pre-restart) logs; when None, auto-detect per container.
+        raw: Return the merged raw lines instead of the reduced summary.
+        should be something like:
+        BaseK8SDeployment(namespace="enrichment", deployment="web"), tail_lines=200
+
+    Returns:
+        str: Merged log lines or their summary, followed by any per-container fetch errors.
+    """
+    try:
+        pods = await _get_deployment_pods(base_k8s_data.namespace, base_k8s_data.deployment)
+        if not pods:
+            return f"Deployment '{base_k8s_data.deployment}' has no pods in namespace '{base_k8s_data.namespace}'"
+
+        api_client = await get_api_client()
+        core = client.CoreV1Api(api_client)
+        semaphore = asyncio.Semaphore(LOG_FETCH_CONCURRENCY)
+
+        async def _fetch(pod: Any, container_name: str) -> tuple[str, str]:
+            source = f"{pod.metadata.name}/{container_name}"
+            prev_flag = previous if previous is not None else _use_previous_logs(pod, container_name)
+            async with semaphore:
                 logs = await core.read_namespaced_pod_log(
-                    name=base_k8s_data.pod,
+                    name=pod.metadata.name,
                     namespace=base_k8s_data.namespace,
                     container=container_name,
                     previous=prev_flag,
                     timestamps=True,
-                    tail_lines=1000,
+                    tail_lines=tail_lines,
                 )
-                return logs or ""
-            except ApiException as exc:
-                logger.exception(f"Failed to read logs for pod '{base_k8s_data.pod}' (container '{container_name}') in namespace '{base_k8s_data.namespace}': {exc}")
-                return ""
+            return source, logs or ""
+
+        targets = [
+            (pod, container.name)
+            for pod in pods
+            for container in getattr(getattr(pod, "spec", None), "containers", None) or []
+        ]
+        results = await asyncio.gather(
+            *(_fetch(pod, container_name) for pod, container_name in targets),
+            return_exceptions=True,
+        )
+
+        merged: list[tuple[str, str, str]] = []
+        seen: set[tuple[str, str]] = set()
+        errors: list[str] = []
+        for (pod, container_name), result in zip(targets, results):
+            if isinstance(result, BaseException):
+                errors.append(f"{pod.metadata.name}/{container_name}: {result}")
+                continue
+            source, logs = result
+            for line in logs.splitlines():
+                timestamp, message = _split_log_timestamp(line)
+                # Only timestamped lines can be recognised as duplicates; repeated untimestamped lines are kept.
+                if timestamp:
+                    if (timestamp, message) in seen:
+                        continue
+                    seen.add((timestamp, message))
+                merged.append((timestamp_sort_key(timestamp), source, f"{timestamp} [{source}] {message}".lstrip()))
+
+        merged.sort(key=lambda item: (item[0], item[1]))
+        logger.info(
+            f"Merged {len(merged)} log lines from {len(targets) - len(errors)} containers "
+            f"of deployment '{base_k8s_data.deployment}' in namespace '{base_k8s_data.namespace}'"
+        )
+        lines = [line for _, _, line in merged]
+        output = "\n".join(lines) if raw else reduce_log_lines(lines).render()
+        if errors:
+            output += "\n\nFailed to fetch logs for:\n" + "\n".join(errors)
+        return output
+    except ValueError as e:
+        return str(e)
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred: {e}")
+        return str(e)
+
+
+def _owner_name(obj: Any, kind: str) -> str | None:
+    """Return the name of the controlling owner of the given kind, if any."""
+    for ref in getattr(getattr(obj, "metadata", None), "owner_references", None) or []:
+        if ref.kind == kind:
+            return ref.name
+    return None
+
+
+class PodHealth(TypedDict):
+    pod: str
+    phase: str
+    ready: bool
+    restarts: int
+    problems: list[str]
+
+
+class WarningSummary(TypedDict):
+    reason: str
+    count: int
+    last_message: str
+
+
+class ReplicaCounts(TypedDict):
+    desired: int
+    ready: int
+    available: int
+    updated: int
+
+
+class WorkloadHealth(TypedDict):
+    deployment: str
+    status: str
+    score: int
+    replicas: ReplicaCounts
+    failing_conditions: list[str]
+    restarts: int
+    problem_pods: list[PodHealth]
+    warning_events: list[WarningSummary]
+
+
+def _pod_health(pod: Any) -> PodHealth:
+    """Summarize one pod's phase, readiness, restarts and container-level problems."""
+    status = pod.status
+    problems: list[str] = []
+    restarts = 0
+    container_statuses = status.container_statuses or []
+    ready = bool(container_statuses) and all(cs.ready for cs in container_statuses)
+    for cs in (status.init_container_statuses or []) + container_statuses:
+        restarts += cs.restart_count or 0
+        waiting = getattr(cs.state, "waiting", None)
+        terminated = getattr(cs.state, "terminated", None)
+        last_terminated = getattr(cs.last_state, "terminated", None)
+        if waiting is not None and waiting.reason not in (None, "ContainerCreating", "PodInitializing"):
+            problems.append(f"{cs.name}: {waiting.reason}")
+        elif terminated is not None and terminated.exit_code not in (None, 0):
+            problems.append(f"{cs.name}: terminated {terminated.reason} (exit {terminated.exit_code})")
+        if last_terminated is not None and last_terminated.reason not in (None, "Completed"):
+            problems.append(f"{cs.name}: last exit {last_terminated.reason} (exit {last_terminated.exit_code})")
+    if status.phase not in ("Running", "Succeeded"):
+        problems.append(f"phase {status.phase}" + (f": {status.reason}" if status.reason else ""))
+    return {
+        "pod": pod.metadata.name,
+        "phase": status.phase,
+        "ready": ready,
+        "restarts": restarts,
+        "problems": problems,
+    }
+
+
+@function_tool
+async def get_namespace_health(
+    base_k8s_data: BaseK8SData,
+    event_window_minutes: int = 60,
+) -> dict[str, object] | str:
+    """Get a ranked health snapshot of every Deployment in a namespace in one call.
+
+    Reads Deployments, ReplicaSets, Pods and Warning Events concurrently and
+    rolls them up per Deployment: replica counts, failing conditions, pod
+    readiness, restart counts, container problems (CrashLoopBackOff, OOMKilled,
+    ImagePullBackOff...) and recent Warning events. Unhealthy workloads come
+    first; healthy ones are only listed by name.
+
+    Args:
+        base_k8s_data: Input containing the target namespace.
+        event_window_minutes: Only count Warning events newer than this.
+        should be something like:
+        BaseK8SData(namespace="enrichment")
+
+    Returns:
+        dict[str, object] | str: The report, or an error message.
+    """
+    namespace = base_k8s_data.namespace
+    try:
+        if not await _validate_namespace(namespace):
+            return f"Namespace '{namespace}' does not exist"
+
+        api_client = await get_api_client()
+        apps = client.AppsV1Api(api_client)
+        core = client.CoreV1Api(api_client)
+        try:
+            deployments, replica_sets, pods, events = await asyncio.gather(
+                apps.list_namespaced_deployment(namespace=namespace),
+                apps.list_namespaced_replica_set(namespace=namespace),
+                core.list_namespaced_pod(namespace=namespace),
+                core.list_namespaced_event(namespace=namespace, field_selector="type=Warning"),
+            )
+        except ApiException as exc:
+            msg = f"Failed to read workloads in namespace '{namespace}': {exc}"
+            logger.exception(msg)
+            return msg
+
+        rs_to_deployment = {
+            rs.metadata.name: _owner_name(rs, "Deployment") for rs in replica_sets.items
+        }
+        pod_to_deployment: dict[str, str | None] = {}
+        pods_by_deployment: dict[str | None, list[PodHealth]] = {}
+        for pod in pods.items:
+            deployment_name = rs_to_deployment.get(_owner_name(pod, "ReplicaSet") or "")
+            pod_to_deployment[pod.metadata.name] = deployment_name
+            pods_by_deployment.setdefault(deployment_name, []).append(_pod_health(pod))
+
+        cutoff = datetime.now(timezone.utc).timestamp() - event_window_minutes * 60
+        warnings_by_deployment: dict[str | None, dict[str, WarningSummary]] = {}
+        for event in events.items:
+            if 0 < event_sort_key(event) < cutoff:
+                continue
+            obj = event.involved_object
+            if obj.kind == "Deployment":
+                deployment_name = obj.name
+            elif obj.kind == "ReplicaSet":
+                deployment_name = rs_to_deployment.get(obj.name)
+            elif obj.kind == "Pod":
+                deployment_name = pod_to_deployment.get(obj.name)
+            else:
+                deployment_name = None
+            by_reason = warnings_by_deployment.setdefault(deployment_name, {})
+            entry = by_reason.setdefault(event.reason, {"reason": event.reason, "count": 0, "last_message": ""})
+            entry["count"] += event.count or 1
+            entry["last_message"] = f"{obj.kind}/{obj.name}: {event.message}"
+
+        workloads: list[WorkloadHealth] = []
+        healthy: list[str] = []
+        for dep in deployments.items:
+            name = dep.metadata.name
+            status = dep.status
+            desired = dep.spec.replicas if dep.spec.replicas is not None else 1
+            ready = status.ready_replicas or 0
+            available = status.available_replicas or 0
+            unavailable = status.unavailable_replicas or 0
+            failing_conditions = [
+                f"{c.type}: {c.reason} - {c.message}"
+                for c in status.conditions or []
+                if (c.type == "ReplicaFailure") == (c.status == "True")
+            ]
+            dep_pods = pods_by_deployment.get(name, [])
+            problem_pods = [p for p in dep_pods if p["problems"] or not p["ready"]]
+            restarts = sum(p["restarts"] for p in dep_pods)
+            warnings = sorted(
+                warnings_by_deployment.get(name, {}).values(), key=lambda w: w["count"], reverse=True
+            )
+
+            score = (
+                max(0, desired - available) * 10
+                + unavailable * 5
+                + len(failing_conditions) * 5
+                + sum(len(p["problems"]) for p in problem_pods) * 3
+                + min(restarts, 20)
+                + sum(w["count"] for w in warnings)
+            )
+            if score == 0:
+                healthy.append(name)
+                continue
+            workloads.append({
+                "deployment": name,
+                "status": "down" if desired > 0 and available == 0 else "degraded",
+                "score": score,
+                "replicas": {"desired": desired, "ready": ready, "available": available, "updated": status.updated_replicas or 0},
+                "failing_conditions": failing_conditions,
+                "restarts": restarts,
+                "problem_pods": problem_pods[:5],
+                "warning_events": warnings[:5],
+            })
+
+        workloads.sort(key=lambda w: w["score"], reverse=True)
+        unowned_problems = [p for p in pods_by_deployment.get(None, []) if p["problems"]]
+        report: dict[str, object] = {
+            "namespace": namespace,
+            "deployments": len(deployments.items),
+            "unhealthy": len(workloads),
+            "pods": len(pods.items),
+            "unhealthy_workloads": workloads,
+            "healthy_deployments": sorted(healthy),
+        }
+        if unowned_problems:
+            report["other_pod_problems"] = unowned_problems[:10]
+        if warnings_by_deployment.get(None):
+            report["other_warning_events"] = list(warnings_by_deployment[None].values())[:10]
+        logger.info(f"Namespace '{namespace}' health: {len(workloads)} unhealthy of {len(deployments.items)} deployments")
+        return report
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred: {e}")
+        return str(e)
+
+
+def _format_event(event: Any) -> dict[str, object]:
+    ts = event.last_timestamp or event.event_time or getattr(event.metadata, "creation_timestamp", None)
+    obj = event.involved_object
+    return {
+        "time": ts.isoformat() if ts is not None else None,
+        "type": event.type,
+        "reason": event.reason,
+        "object": f"{obj.kind}/{obj.name}",
+        "count": event.count or 1,
+        "message": event.message,
+    }
+
+
+async def _list_events(
+    namespace: str,
+    kind: str | None = None,
+    name: str | None = None,
+    reason: str | None = None,
+    limit: int = 50,
+) -> list[Any]:
+    """Return matching Events (oldest first), from the namespace's event collector when fresh."""
+    collector = events_collector(namespace)
+    if collector.is_fresh():
+        if kind and name:
+            events = collector.for_object(kind, name)
+        elif reason:
+            events = collector.for_reason(reason)
+        else:
+            events = collector.recent(EVENTS_BUFFER_SIZE)
+    else:
+        selectors = [
+            f"{field}={value}"
+            for field, value in (("involvedObject.kind", kind), ("involvedObject.name", name), ("reason", reason))
+            if value
+        ]
+        api_client = await get_api_client()
+        core = client.CoreV1Api(api_client)
+        try:
+            resp = await core.list_namespaced_event(
+                namespace=namespace, field_selector=",".join(selectors) or None
+            )
+        except ApiException as exc:
+            msg = f"Failed to list events in namespace '{namespace}': {exc}"
+            logger.exception(msg)
+            raise ValueError(msg)
+        events = sorted(resp.items, key=event_sort_key)
+
+    events = [
+        e for e in events
+        if (kind is None or e.involved_object.kind == kind)
+        and (name is None or e.involved_object.name == name)
+        and (reason is None or e.reason == reason)
+    ]
+    return events[-limit:]
+
+
+_QUANTITY_SUFFIXES: dict[str, float] = {
+    "Ki": 2**10, "Mi": 2**20, "Gi": 2**30, "Ti": 2**40, "Pi": 2**50, "Ei": 2**60,
+    "n": 1e-9, "u": 1e-6, "m": 1e-3,
+    "": 1.0, "k": 1e3, "M": 1e6, "G": 1e9, "T": 1e12, "P": 1e15, "E": 1e18,
+}
+# <number><suffix>, where the suffix is a binary/decimal SI unit or a decimal exponent ("128974848e0", "1E3").
+# A bare "E" is exa; "E" followed by digits is an exponent.
+_QUANTITY_PATTERN = re.compile(
+    r"^([+-]?(?:\d+(?:\.\d*)?|\.\d+))(?:[eE]([+-]?\d+)|(" + "|".join(s for s in _QUANTITY_SUFFIXES if s) + r"))?$"
+)
+
+
+def _parse_quantity(quantity: str) -> float:
+    """Parse a Kubernetes resource quantity into cores (CPU) or bytes (memory).
+
+    Raises ValueError when the string is not a valid quantity.
+    """
+    match = _QUANTITY_PATTERN.match(quantity.strip())
+    if match is None:
+        raise ValueError(f"Invalid Kubernetes quantity '{quantity}'")
+    number, exponent, suffix = match.groups()
+    if exponent is not None:
+        return float(number) * 10 ** int(exponent)
+    return float(number) * _QUANTITY_SUFFIXES[suffix or ""]
+
+
+async def _get_pod_usage(namespace: str, pod: str | None = None) -> dict[str, dict[str, dict[str, float]]]:
+    """Read metrics.k8s.io pod usage as {pod: {container: {"cpu_m": ..., "memory_mib": ...}}}.
+
+    Raises ValueError when the metrics API is disabled or not served by the cluster.
+    """
+    if not METRICS_ENABLED:
+        raise ValueError("metrics.k8s.io reader is disabled (K8S_METRICS_ENABLED=false)")
+    api_client = await get_api_client()
+    custom = client.CustomObjectsApi(api_client)
+    try:
+        if pod is None:
+            resp = await custom.list_namespaced_custom_object("metrics.k8s.io", "v1beta1", namespace, "pods")
+            items = resp.get("items", [])
+        else:
+            items = [await custom.get_namespaced_custom_object("metrics.k8s.io", "v1beta1", namespace, "pods", pod)]
+    except ApiException as exc:
+        if exc.status == 404:
+            raise ValueError(f"No metrics.k8s.io data for {pod or 'pods'} in namespace '{namespace}' (metrics-server missing or pod not found)")
+        msg = f"Failed to read pod metrics in namespace '{namespace}': {exc}"
+        logger.exception(msg)
+        raise ValueError(msg)
+
+    return {
+        item["metadata"]["name"]: {
+            c["name"]: {
+                "cpu_m": round(_parse_quantity(c["usage"]["cpu"]) * 1000, 1),
+                "memory_mib": round(_parse_quantity(c["usage"]["memory"]) / 2**20, 1),
+            }
+            for c in item.get("containers", [])
+        }
+        for item in items
+    }
+
+
+def _container_limits(pod: Any) -> dict[str, dict[str, float]]:
+    """Return {container: {"cpu_m": limit, "memory_mib": limit}} for the limits that are set."""
+    limits: dict[str, dict[str, float]] = {}
+    for c in getattr(getattr(pod, "spec", None), "containers", None) or []:
+        declared = getattr(c.resources, "limits", None) or {}
+        entry: dict[str, float] = {}
+        if "cpu" in declared:
+            entry["cpu_m"] = round(_parse_quantity(declared["cpu"]) * 1000, 1)
+        if "memory" in declared:
+            entry["memory_mib"] = round(_parse_quantity(declared["memory"]) / 2**20, 1)
+        limits[c.name] = entry
+    return limits
+
+
+@function_tool
+async def get_events(
+    base_k8s_data: BaseK8SData,
+    kind: str | None = None,
+    name: str | None = None,
+    reason: str | None = None,
+    limit: int = 50,
+) -> list[dict[str, object]] | str:
+    """Get recent Kubernetes Events in a namespace, optionally for one object or reason.
+
+    Served from a watch-backed per-namespace ring buffer once it is warm, so
+    repeated questions do not re-list events.
+
+    Args:
+        base_k8s_data: Input containing the target namespace.
+        kind: Involved object kind, e.g. "Pod" or "Deployment" (use with name).
+        name: Involved object name.
+        reason: Event reason, e.g. "BackOff", "OOMKilling", "Unhealthy", "FailedScheduling".
+        limit: Maximum number of events to return (newest kept).
+        should be something like:
+        BaseK8SData(namespace="enrichment"), kind="Pod", name="web-abc-123"
+
+    Returns:
+        list[dict[str, object]] | str: Events oldest first, or an error message.
+    """
+    try:
+        if not await _validate_namespace(base_k8s_data.namespace):
+            return f"Namespace '{base_k8s_data.namespace}' does not exist"
+        events = await _list_events(base_k8s_data.namespace, kind, name, reason, limit)
+        return [_format_event(e) for e in events]
+    except ValueError as e:
+        return str(e)
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred: {e}")
+        return str(e)
+
+
+async def _get_pods_by_name(namespace: str, pod: str | None = None) -> dict[str, Any]:
+    """Return {name: pod} for one pod or every pod in a namespace, from the informer cache when fresh.
+
+    The namespace must already be validated: this starts its pods informer.
+    """
+    informer = pods_informer(namespace)
+    if informer.is_fresh():
+        if pod is not None:
+            cached = informer.get(pod)
+            return {pod: cached} if cached is not None else {}
+        return {item.metadata.name: item for item in informer.items()}
+
+    api_client = await get_api_client()
+    core = client.CoreV1Api(api_client)
+    try:
+        if pod is not None:
+            return {pod: await core.read_namespaced_pod(name=pod, namespace=namespace)}
+        resp = await core.list_namespaced_pod(namespace=namespace)
+    except ApiException as exc:
+        msg = f"Failed to read pods in namespace '{namespace}': {exc}"
+        logger.exception(msg)
+        raise ValueError(msg)
+    return {item.metadata.name: item for item in resp.items if item.metadata is not None}
+
+
+async def _get_pod_limits(namespace: str, pod: str | None = None) -> dict[str, dict[str, dict[str, float]]]:
+    """Return {pod: container limits}; empty when the pods cannot be read, since limits are only context for usage."""
+    try:
+        pods = await _get_pods_by_name(namespace, pod)
+    except ValueError:
+        return {}
+    return {name: _container_limits(item) for name, item in pods.items()}
+
+
+@function_tool
+async def get_pod_metrics(
+    base_k8s_data: BaseK8SData,
+    pod: str | None = None,
+) -> dict[str, dict[str, dict[str, float]]] | str:
+    """Get current CPU/memory usage per container from metrics.k8s.io, with limits for comparison.
+
+    Args:
+        base_k8s_data: Input containing the target namespace.
+        pod: A single pod name; all pods in the namespace when omitted.
+        should be something like:
+        BaseK8SData(namespace="enrichment"), pod="web-abc-123"
+
+    Returns:
+        dict[str, dict[str, dict[str, float]]] | str: {pod: {container: {cpu_m, memory_mib, cpu_limit_m, memory_limit_mib}}}
+        or an error message (e.g. when metrics-server is not installed).
+    """
+    try:
+        if not await _validate_namespace(base_k8s_data.namespace):
+            return f"Namespace '{base_k8s_data.namespace}' does not exist"
+        usage, limits_by_pod = await asyncio.gather(
+            _get_pod_usage(base_k8s_data.namespace, pod),
+            _get_pod_limits(base_k8s_data.namespace, pod),
+        )
+        for pod_name, containers in usage.items():
+            limits = limits_by_pod.get(pod_name, {})
+            for container_name, values in containers.items():
+                container_limits = limits.get(container_name, {})
+                if "cpu_m" in container_limits:
+                    values["cpu_limit_m"] = container_limits["cpu_m"]
+                if "memory_mib" in container_limits:
+                    values["memory_limit_mib"] = container_limits["memory_mib"]
+        return usage
+    except ValueError as e:
+        return str(e)
     except Exception as e:
         logger.exception(f"An unexpected error occurred: {e}")
-        return str(e)
\ No newline at end of file
+        return str(e)
+
+
+@function_tool
+async def explain_pod_restarts(base_k8s_data: BaseK8SPod) -> dict[str, object] | str:
+    """Explain why a Pod's containers restarted.
+
+    Combines each container's restart count, current state and last termination
+    (reason such as OOMKilled, exit code, timestamps) with its limits, the Pod's
+    recent Events (probe failures, BackOff, OOMKilling, evictions) and, when
+    metrics.k8s.io is available, current CPU/memory usage.
+
+    Args:
+        base_k8s_data: Input containing namespace and pod name.
+        should be something like:
+        BaseK8SPod(namespace="enrichment", pod="web-abc-123")
+
+    Returns:
+        dict[str, object] | str: The explanation data, or an error message.
+    """
+    namespace = base_k8s_data.namespace
+    try:
+        if not await _validate_namespace(namespace):
+            return f"Namespace '{namespace}' does not exist"
+        api_client = await get_api_client()
+        core = client.CoreV1Api(api_client)
+
+        async def _read_pod() -> Any:
+            informer = pods_informer(namespace)
+            cached = informer.get(base_k8s_data.pod) if informer.is_fresh() else None
+            return cached or await core.read_namespaced_pod(name=base_k8s_data.pod, namespace=namespace)
+
+        async def _read_usage() -> dict[str, dict[str, float]] | str:
+            try:
+                return (await _get_pod_usage(namespace, base_k8s_data.pod)).get(base_k8s_data.pod, {})
+            except ValueError as e:
+                return str(e)
+
+        try:
+            pod, events, usage = await asyncio.gather(
+                _read_pod(),
+                _list_events(namespace, "Pod", base_k8s_data.pod, limit=30),
+                _read_usage(),
+            )
+        except ApiException as exc:
+            msg = f"Failed to read pod '{base_k8s_data.pod}' in namespace '{namespace}': {exc}"
+            logger.exception(msg)
+            return msg
+
+        limits = _container_limits(pod)
+        containers: list[dict[str, object]] = []
+        for cs in pod.status.container_statuses or []:
+            last = getattr(cs.last_state, "terminated", None)
+            waiting = getattr(cs.state, "waiting", None)
+            entry: dict[str, object] = {
+                "container": cs.name,
+                "restarts": cs.restart_count or 0,
+                "ready": bool(cs.ready),
+                "state": "waiting" if waiting else "running" if cs.state.running else "terminated",
+                "waiting_reason": waiting.reason if waiting else None,
+                "limits": limits.get(cs.name, {}),
+            }
+            if last is not None:
+                entry["last_termination"] = {
+                    "reason": last.reason,
+                    "exit_code": last.exit_code,
+                    "signal": last.signal,
+                    "started_at": last.started_at.isoformat() if last.started_at else None,
+                    "finished_at": last.finished_at.isoformat() if last.finished_at else None,
+                    "message": last.message,
+                }
+                if last.reason == "OOMKilled":
+                    entry["hint"] = "killed for exceeding its memory limit"
+                elif last.exit_code == 137:
+                    entry["hint"] = "SIGKILL without OOMKilled: usually a failed liveness probe or an eviction; check events"
+            if isinstance(usage, dict) and cs.name in usage:
+                entry["usage"] = usage[cs.name]
+            containers.append(entry)
+
+        report: dict[str, object] = {
+            "namespace": namespace,
+            "pod": base_k8s_data.pod,
+            "phase": pod.status.phase,
+            "reason": pod.status.reason,
+            "containers": containers,
+            "events": [_format_event(e) for e in events],
+        }
+        if isinstance(usage, str):
+            report["metrics"] = usage
+        return report
+    except ValueError as e:
+        return str(e)
+    except Exception as e:
+        logger.exception(f"An unexpected error occurred: {e}")
+        return str(e)
@@ -0,0 +1,72 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Awaitable, Callable
+
+from kubernetes_asyncio import client, config
+from kubernetes_asyncio.config.kube_config import KubeConfigLoader
+
+
+logger = logging.getLogger(__name__)
+
+CONNECTION_POOL_MAXSIZE = int(os.getenv("K8S_CONNECTION_POOL_MAXSIZE", "20"))
+CREDENTIAL_REFRESH_SECONDS = int(os.getenv("K8S_CREDENTIAL_REFRESH_SECONDS", "300"))
+
+_api_client: client.ApiClient | None = None
+_api_client_lock = asyncio.Lock()
+
+
+def _build_credential_refresh_hook(
+    loader: KubeConfigLoader,
+) -> Callable[[client.Configuration], Awaitable[None]]:
+    """Return a refresh_api_key_hook that re-runs the kubeconfig auth loader at most every CREDENTIAL_REFRESH_SECONDS.
+
+    The loader itself only re-executes exec/OIDC/GCP auth when the cached token is
+    expired, so this keeps long-lived clients authenticated without re-parsing
+    kubeconfig on every request.
+    """
+    refreshed_at = time.monotonic()
+
+    async def _refresh(configuration: client.Configuration) -> None:
+        nonlocal refreshed_at
+        if time.monotonic() - refreshed_at < CREDENTIAL_REFRESH_SECONDS:
+            return
+        refreshed_at = time.monotonic()
+        try:
+            await loader.load_and_set(configuration)
+        except Exception as exc:
+            logger.exception(f"Failed to refresh kube credentials: {exc}")
+
+    return _refresh
+
+
+async def get_api_client() -> client.ApiClient:
+    """Return the process-wide ApiClient, loading kubeconfig once on first use.
+
+    All k8s tools share this client and its aiohttp connection pool
+    (K8S_CONNECTION_POOL_MAXSIZE connections) instead of opening one per call.
+    """
+    global _api_client
+    if _api_client is not None:
+        return _api_client
+
+    async with _api_client_lock:
+        if _api_client is None:
+            configuration = client.Configuration()
+            loader = await config.load_kube_config(client_configuration=configuration)
+            configuration.connection_pool_maxsize = CONNECTION_POOL_MAXSIZE
+            configuration.refresh_api_key_hook = _build_credential_refresh_hook(loader)
+            _api_client = client.ApiClient(configuration=configuration)
+            logger.info(f"Created shared kube ApiClient for {configuration.host}")
+    return _api_client
+
+
+async def close_api_client() -> None:
+    """Close the shared ApiClient; call once when the process shuts down."""
+    global _api_client
+    async with _api_client_lock:
+        if _api_client is not None:
+            await _api_client.close()
+            _api_client = None
+            logger.info("Closed shared kube ApiClient")
@@ -0,0 +1,300 @@
+import asyncio
+import logging
+import os
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, TypeVar, cast
+
+from kubernetes_asyncio import client, watch
+from kubernetes_asyncio.client.exceptions import ApiException
+
+from resources.tools.k8s_client import get_api_client
+
+
+logger = logging.getLogger(__name__)
+
+WATCH_TIMEOUT_SECONDS = int(os.getenv("K8S_INFORMER_WATCH_TIMEOUT_SECONDS", "240"))
+STALE_AFTER_SECONDS = int(os.getenv("K8S_INFORMER_STALE_SECONDS", "600"))
+RETRY_BACKOFF_SECONDS = float(os.getenv("K8S_INFORMER_RETRY_BACKOFF_SECONDS", "5"))
+MAX_NAMESPACED_INFORMERS = int(os.getenv("K8S_INFORMER_MAX_NAMESPACES", "20"))
+EVENTS_BUFFER_SIZE = int(os.getenv("K8S_EVENTS_BUFFER_SIZE", "2000"))
+
+ListFuncFactory = Callable[[client.ApiClient], Callable[..., Awaitable[Any]]]
+IndexKey = TypeVar("IndexKey")
+
+
+class Informer:
+    """In-memory mirror of one Kubernetes list, kept current by a watch stream.
+
+    The background task lists the resource once, then watches from the returned
+    resourceVersion, applying ADDED/MODIFIED/DELETED events to a name-keyed store.
+    Each watch round is bounded by WATCH_TIMEOUT_SECONDS and resumed from the last
+    seen resourceVersion; a 410 Gone (expired version) or any other failure
+    triggers a fresh list.
+
+    Readers must check is_fresh() and fall back to a live API call when it is False,
+    which covers the cold start and a watch that has stopped making progress.
+    """
+
+    def __init__(self, name: str, list_func_factory: ListFuncFactory, **list_kwargs: Any):
+        self.name = name
+        self._list_func_factory = list_func_factory
+        self._list_kwargs = list_kwargs
+        self._store: dict[str, Any] = {}
+        self._synced = False
+        self._heartbeat_at = 0.0
+        self._task: asyncio.Task | None = None
+
+    def ensure_started(self) -> None:
+        """Start the list/watch task if it is not already running."""
+        if self._task is None or self._task.done():
+            self._synced = False
+            self._task = asyncio.create_task(self._run(), name=f"k8s-informer-{self.name}")
+
+    def stop(self) -> asyncio.Task | None:
+        """Cancel the list/watch task and return it, so callers can wait for it to exit."""
+        task, self._task = self._task, None
+        if task is not None:
+            task.cancel()
+        self._synced = False
+        self._store = {}
+        return task
+
+    def is_fresh(self) -> bool:
+        """Return True if the store is synced and the watch has made progress recently."""
+        return (
+            self._synced
+            and self._task is not None
+            and not self._task.done()
+            and time.monotonic() - self._heartbeat_at < STALE_AFTER_SECONDS
+        )
+
+    def names(self) -> list[str]:
+        return list(self._store)
+
+    def items(self) -> list[Any]:
+        return list(self._store.values())
+
+    def get(self, name: str) -> Any | None:
+        return self._store.get(name)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self._store
+
+    def _put(self, name: str, obj: Any) -> None:
+        self._store[name] = obj
+
+    def _remove(self, name: str) -> None:
+        self._store.pop(name, None)
+
+    def _replace(self, items: list[Any]) -> None:
+        self._store = {item.metadata.name: item for item in items}
+
+    def _apply_event(self, event: dict[str, Any]) -> None:
+        self._heartbeat_at = time.monotonic()
+        event_type = event.get("type")
+        if event_type == "BOOKMARK":
+            return
+        obj = event.get("object")
+        name = getattr(getattr(obj, "metadata", None), "name", None)
+        if name is None:
+            return
+        if event_type == "DELETED":
+            self._remove(name)
+        else:
+            self._put(name, obj)
+
+    async def _list(self, list_func: Callable[..., Awaitable[Any]]) -> str | None:
+        resp = await list_func(**self._list_kwargs)
+        self._replace([
+            item
+            for item in resp.items
+            if item.metadata is not None and item.metadata.name is not None
+        ])
+        self._synced = True
+        self._heartbeat_at = time.monotonic()
+        logger.info(f"Informer '{self.name}' synced {len(self._store)} objects")
+        return resp.metadata.resource_version
+
+    async def _run(self) -> None:
+        while True:
+            try:
+                api_client = await get_api_client()
+                list_func = self._list_func_factory(api_client)
+                resource_version = await self._list(list_func)
+                while True:
+                    async with watch.Watch() as w:
+                        async for event in w.stream(
+                            list_func,
+                            resource_version=resource_version,
+                            allow_watch_bookmarks=True,
+                            timeout_seconds=WATCH_TIMEOUT_SECONDS,
+                            _request_timeout=WATCH_TIMEOUT_SECONDS + 30,
+                            **self._list_kwargs,
+                        ):
+                            self._apply_event(event)
+                        resource_version = w.resource_version or resource_version
+                    self._heartbeat_at = time.monotonic()
+            except asyncio.CancelledError:
+                raise
+            except ApiException as exc:
+                if exc.status == 410:
+                    logger.info(f"Informer '{self.name}' resourceVersion expired; relisting")
+                    continue
+                self._synced = False
+                logger.warning(f"Informer '{self.name}' failed: {exc}; retrying in {RETRY_BACKOFF_SECONDS}s")
+            except Exception as exc:
+                self._synced = False
+                logger.warning(f"Informer '{self.name}' failed: {exc}; retrying in {RETRY_BACKOFF_SECONDS}s")
+            await asyncio.sleep(RETRY_BACKOFF_SECONDS)
+
+
+_namespaces_informer: Informer | None = None
+_NAMESPACED_INFORMERS: OrderedDict[tuple[str, str], Informer] = OrderedDict()
+
+
+def namespaces_informer() -> Informer:
+    """Return the cluster-wide namespace informer, starting it on first use."""
+    global _namespaces_informer
+    if _namespaces_informer is None:
+        _namespaces_informer = Informer(
+            "namespaces", lambda api_client: client.CoreV1Api(api_client).list_namespace
+        )
+    _namespaces_informer.ensure_started()
+    return _namespaces_informer
+
+
+def _namespaced_informer(
+    kind: str,
+    namespace: str,
+    list_func_factory: ListFuncFactory,
+    informer_cls: type[Informer] = Informer,
+) -> Informer:
+    key = (kind, namespace)
+    informer = _NAMESPACED_INFORMERS.get(key)
+    if informer is None:
+        informer = informer_cls(f"{kind}/{namespace}", list_func_factory, namespace=namespace)
+        _NAMESPACED_INFORMERS[key] = informer
+        while len(_NAMESPACED_INFORMERS) > MAX_NAMESPACED_INFORMERS:
+            _, evicted = _NAMESPACED_INFORMERS.popitem(last=False)
+            evicted.stop()
+            logger.info(f"Stopped least recently used informer '{evicted.name}'")
+    else:
+        _NAMESPACED_INFORMERS.move_to_end(key)
+    informer.ensure_started()
+    return informer
+
+
+def deployments_informer(namespace: str) -> Informer:
+    """Return the Deployment informer for a namespace, starting it on first use."""
+    return _namespaced_informer(
+        "deployments",
+        namespace,
+        lambda api_client: client.AppsV1Api(api_client).list_namespaced_deployment,
+    )
+
+
+def pods_informer(namespace: str) -> Informer:
+    """Return the Pod informer for a namespace, starting it on first use."""
+    return _namespaced_informer(
+        "pods",
+        namespace,
+        lambda api_client: client.CoreV1Api(api_client).list_namespaced_pod,
+    )
+
+
+def _discard_from_index(index: dict[IndexKey, set[str]], key: IndexKey, name: str) -> None:
+    """Remove one name from a secondary index, dropping the key once it is empty."""
+    names = index.get(key)
+    if names is not None:
+        names.discard(name)
+        if not names:
+            del index[key]
+
+
+class EventCollector(Informer):
+    """Informer for core/v1 Events that keeps only the newest K8S_EVENTS_BUFFER_SIZE per namespace.
+
+    The store behaves as a ring buffer: an updated event moves to the newest end
+    and overflow evicts the oldest. Secondary indexes by involved object
+    (kind, name) and by reason are kept in step with evictions.
+    """
+
+    def __init__(self, name: str, list_func_factory: ListFuncFactory, **list_kwargs: Any):
+        super().__init__(name, list_func_factory, **list_kwargs)
+        self._store: OrderedDict[str, Any] = OrderedDict()
+        self._by_object: dict[tuple[str, str], set[str]] = {}
+        self._by_reason: dict[str, set[str]] = {}
+
+    def _index_keys(self, event: Any) -> tuple[tuple[str, str], str]:
+        obj = event.involved_object
+        return (obj.kind or "", obj.name or ""), event.reason or ""
+
+    def _put(self, name: str, obj: Any) -> None:
+        if name in self._store:
+            self._remove(name)
+        self._store[name] = obj
+        object_key, reason = self._index_keys(obj)
+        self._by_object.setdefault(object_key, set()).add(name)
+        self._by_reason.setdefault(reason, set()).add(name)
+        while len(self._store) > EVENTS_BUFFER_SIZE:
+            self._remove(next(iter(self._store)))
+
+    def _remove(self, name: str) -> None:
+        event = self._store.pop(name, None)
+        if event is None:
+            return
+        object_key, reason = self._index_keys(event)
+        _discard_from_index(self._by_object, object_key, name)
+        _discard_from_index(self._by_reason, reason, name)
+
+    def _replace(self, items: list[Any]) -> None:
+        self._store = OrderedDict()
+        self._by_object = {}
+        self._by_reason = {}
+        for item in sorted(items, key=event_sort_key)[-EVENTS_BUFFER_SIZE:]:
+            self._put(item.metadata.name, item)
+
+    def _select(self, names: set[str] | None) -> list[Any]:
+        return sorted((self._store[n] for n in names or ()), key=event_sort_key)
+
+    def for_object(self, kind: str, name: str) -> list[Any]:
+        """Return buffered events about one object, oldest first."""
+        return self._select(self._by_object.get((kind, name)))
+
+    def for_reason(self, reason: str) -> list[Any]:
+        """Return buffered events with one reason, oldest first."""
+        return self._select(self._by_reason.get(reason))
+
+    def recent(self, limit: int) -> list[Any]:
+        """Return the newest buffered events, oldest first."""
+        return sorted(self._store.values(), key=event_sort_key)[-limit:]
+
+
+def event_sort_key(event: Any) -> float:
+    """Sort key for core/v1 Events: last occurrence, falling back to eventTime and creation time."""
+    ts = event.last_timestamp or event.event_time or getattr(event.metadata, "creation_timestamp", None)
+    return ts.timestamp() if ts is not None else 0.0
+
+
+def events_collector(namespace: str) -> EventCollector:
+    """Return the Event collector for a namespace, starting it on first use."""
+    # The ("events", namespace) slot is only ever filled with an EventCollector.
+    return cast(EventCollector, _namespaced_informer(
+        "events",
+        namespace,
+        lambda api_client: client.CoreV1Api(api_client).list_namespaced_event,
+        informer_cls=EventCollector,
+    ))
+
+
+async def stop_informers() -> None:
+    """Cancel every informer task and wait for the watches to exit; call before closing the shared ApiClient."""
+    global _namespaces_informer
+    informers = list(_NAMESPACED_INFORMERS.values())
+    if _namespaces_informer is not None:
+        informers.append(_namespaces_informer)
+        _namespaces_informer = None
+    _NAMESPACED_INFORMERS.clear()
+    tasks = [task for task in (informer.stop() for informer in informers) if task is not None]
+    await asyncio.gather(*tasks, return_exceptions=True)
@@ -0,0 +1,363 @@
+import hashlib
+import json
+import logging
+import os
+import re
+from collections import OrderedDict
+from datetime import datetime, timezone
+from typing import Any, Iterable
+
+from agents.tool import function_tool
+from pydantic import BaseModel, Field
+
+
+logger = logging.getLogger(__name__)
+
+MAX_TEMPLATES = int(os.getenv("LOG_REDUCER_MAX_TEMPLATES", "40"))
+MAX_ERROR_LINES = int(os.getenv("LOG_REDUCER_MAX_ERROR_LINES", "50"))
+SIMILARITY_THRESHOLD = float(os.getenv("LOG_REDUCER_SIMILARITY_THRESHOLD", "0.5"))
+RAW_STORE_MAX_ENTRIES = int(os.getenv("LOG_REDUCER_RAW_STORE_MAX_ENTRIES", "32"))
+RAW_LINES_PAGE_MAX = 500
+MAX_SOURCES_SHOWN = 3
+MAX_STREAMS_SHOWN = 10
+# Loki stream labels that identify where a line came from; all labels are used when none of these is set.
+SOURCE_LABELS = ("namespace", "app_kubernetes_io_name", "app", "service_name", "pod", "container")
+
+WILDCARD = "<*>"
+
+TIMESTAMP_PATTERN = re.compile(
+    r"^\s*(\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?)\s*"
+)
+# Applied in order; earlier masks win so a UUID is not half-eaten by the number mask.
+MASKS: list[tuple[re.Pattern[str], str]] = [
+    (re.compile(r"\b[0-9a-fA-F]{8}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{4}-[0-9a-fA-F]{12}\b"), "<UUID>"),
+    (re.compile(r"\b\d{1,3}(?:\.\d{1,3}){3}(?::\d+)?\b"), "<IP>"),
+    (re.compile(r"\b\d{4}-\d{2}-\d{2}[T ]\d{2}:\d{2}:\d{2}(?:[.,]\d+)?(?:Z|[+-]\d{2}:?\d{2})?"), "<TS>"),
+    (re.compile(r"\b0x[0-9a-fA-F]+\b"), "<HEX>"),
+    (re.compile(r"\b(?=[0-9a-fA-F]*\d)(?=[0-9a-fA-F]*[a-fA-F])[0-9a-fA-F]{8,}\b"), "<ID>"),
+    (re.compile(r"\b(?=[A-Za-z0-9_-]*\d)(?=[A-Za-z0-9_-]*[A-Za-z])[A-Za-z0-9_-]{16,}\b"), "<ID>"),
+    (re.compile(r"(?<![A-Za-z])[-+]?\d+(?:\.\d+)?(?:ms|s|m|h|kb|mb|gb|%)?(?![A-Za-z])"), "<NUM>"),
+]
+TIMESTAMP_PARTS_PATTERN = re.compile(r"^(.*?)(?:[.,](\d+))?(Z|[+-]\d{2}:?\d{2})?$")
+ERROR_PATTERN = re.compile(
+    r"\b(?:ERROR|FATAL|CRITICAL|PANIC|EXCEPTION|Traceback|Exception|Error)\b|level=(?:error|fatal)|\"level\"\s*:\s*\"(?:error|fatal|critical)\"",
+)
+
+
+def _render_counts(counts: dict[str, int], limit: int) -> str:
+    """Render the first entries of a {source: count} dict as 'source xN, ...', noting how many were left out."""
+    shown = list(counts.items())[:limit]
+    more = len(counts) - len(shown)
+    return ", ".join(f"{source} x{count}" for source, count in shown) + (f" (+{more} more)" if more else "")
+
+
+class LogTemplate(BaseModel):
+    template_id: str = Field(description="Stable id within this summary; pass to get_raw_log_lines")
+    template: str = Field(description="Masked line with variable parts replaced by <*> or a typed mask")
+    count: int
+    first_seen: str | None = None
+    last_seen: str | None = None
+    sample: str = Field(description="One verbatim line matching the template")
+    sources: dict[str, int] = Field(default_factory=dict, description="Line count per Loki stream the template was seen in")
+
+
+class LogSummary(BaseModel):
+    log_id: str = Field(description="Handle for retrieving the raw lines with get_raw_log_lines")
+    total_lines: int
+    templates: list[LogTemplate]
+    omitted_templates: int = 0
+    error_line_count: int = 0
+    error_lines: list[str] = Field(default_factory=list, description="Error-level lines, verbatim (most recent last)")
+    sources: dict[str, int] = Field(default_factory=dict, description="Line count per Loki stream, e.g. {'{app=\"api\"}': 120}")
+
+    def render(self) -> str:
+        """Render the summary as compact text for a model context."""
+        parts = [
+            f"log_id={self.log_id} lines={self.total_lines} templates={len(self.templates) + self.omitted_templates}"
+            + (f" (showing top {len(self.templates)})" if self.omitted_templates else "")
+        ]
+        if self.sources:
+            parts.append("Streams: " + _render_counts(self.sources, MAX_STREAMS_SHOWN))
+        for t in self.templates:
+            seen = f" {t.first_seen} .. {t.last_seen}" if t.first_seen else ""
+            parts.append(f"[{t.template_id}] x{t.count}{seen} | {t.template}")
+            if t.sources:
+                parts.append("    from " + _render_counts(t.sources, MAX_SOURCES_SHOWN))
+        if self.error_lines:
+            shown = len(self.error_lines)
+            parts.append("")
+            parts.append(
+                f"Error lines ({self.error_line_count}"
+                + (f", last {shown} shown" if shown < self.error_line_count else "")
+                + "):"
+            )
+            parts.extend(self.error_lines)
+        parts.append("")
+        parts.append(f'Raw lines: get_raw_log_lines(log_id="{self.log_id}", template_id=...)')
+        return "\n".join(parts)
+
+
+class _Cluster:
+    __slots__ = ("tokens", "count", "first_seen", "last_seen", "sample", "line_indexes", "sources")
+
+    def __init__(self, tokens: list[str], timestamp: str | None, line: str, index: int, source: str | None):
+        self.tokens = tokens
+        self.count = 1
+        self.first_seen = timestamp
+        self.last_seen = timestamp
+        self.sample = line
+        self.line_indexes = [index]
+        self.sources: dict[str, int] = {source: 1} if source else {}
+
+    def similarity(self, tokens: list[str]) -> float:
+        same = sum(1 for a, b in zip(self.tokens, tokens) if a == b or a == WILDCARD)
+        return same / len(tokens) if tokens else 1.0
+
+    def add(self, tokens: list[str], timestamp: str | None, index: int, source: str | None) -> None:
+        self.tokens = [a if a == b else WILDCARD for a, b in zip(self.tokens, tokens)]
+        self.count += 1
+        if source:
+            self.sources[source] = self.sources.get(source, 0) + 1
+        if timestamp:
+            key = timestamp_sort_key(timestamp)
+            if self.first_seen is None or key < timestamp_sort_key(self.first_seen):
+                self.first_seen = timestamp
+            if self.last_seen is None or key > timestamp_sort_key(self.last_seen):
+                self.last_seen = timestamp
+        self.line_indexes.append(index)
+
+
+# (timestamp, line, source): source is the Loki stream selector the line came from, if any
+LogEntry = tuple[str | None, str, str | None]
+
+# log_id -> (raw lines, template_id -> line indexes)
+_RAW_STORE: OrderedDict[str, tuple[list[str], dict[str, list[int]]]] = OrderedDict()
+
+
+def timestamp_sort_key(timestamp: str) -> str:
+    """Return a lexicographically sortable key for an RFC3339Nano timestamp.
+
+    Emitters such as the kubelet trim trailing zeros from the fractional
+    seconds, so '...:05.1Z' and '...:05.02Z' must be padded before comparing.
+    A 'Z' zone is dropped; numeric offsets are kept, so compare timestamps
+    from one source only.
+    """
+    match = TIMESTAMP_PARTS_PATTERN.match(timestamp)
+    if match is None:
+        return timestamp
+    base, fraction, zone = match.groups()
+    return f"{base}.{(fraction or '').ljust(9, '0')}{'' if zone in (None, 'Z') else zone}"
+
+
+def _by_count(counts: dict[str, int]) -> dict[str, int]:
+    return dict(sorted(counts.items(), key=lambda item: item[1], reverse=True))
+
+
+def split_timestamp(line: str) -> tuple[str | None, str]:
+    """Split a leading RFC3339/ISO timestamp from a log line, if there is one."""
+    match = TIMESTAMP_PATTERN.match(line)
+    if match is None:
+        return None, line
+    return match.group(1), line[match.end():]
+
+
+def mask_line(message: str) -> str:
+    """Replace numbers, UUIDs, IPs, hex and other ID-like tokens with typed placeholders."""
+    for pattern, placeholder in MASKS:
+        message = pattern.sub(placeholder, message)
+    return message
+
+
+def is_error_line(line: str) -> bool:
+    return ERROR_PATTERN.search(line) is not None
+
+
+def reduce_log_entries(
+    entries: Iterable[LogEntry],
+    max_templates: int = MAX_TEMPLATES,
+    max_error_lines: int = MAX_ERROR_LINES,
+) -> LogSummary:
+    """Cluster (timestamp, line) entries into Drain-style templates.
+
+    Each line is masked, tokenized on whitespace and matched against existing
+    clusters with the same token count and first token; it joins the most
+    similar cluster at or above SIMILARITY_THRESHOLD (differing tokens become
+    <*>), otherwise it starts a new one. Error-level lines are also kept
+    verbatim. A line's source (its Loki stream) is kept on the raw line and
+    counted per template, so clusters can be traced back to the service that
+    logged them. The raw lines are stored under the returned log_id so they
+    can be fetched later with get_raw_lines.
+    """
+    raw_lines: list[str] = []
+    groups: dict[tuple[int, str], list[_Cluster]] = {}
+    clusters: list[_Cluster] = []
+    error_lines: list[str] = []
+    error_line_count = 0
+    sources: dict[str, int] = {}
+
+    for index, (timestamp, line, source) in enumerate(entries):
+        raw_lines.append(" ".join(part for part in (timestamp, source, line) if part))
+        if source:
+            sources[source] = sources.get(source, 0) + 1
+        tokens = mask_line(line).split()
+        # As in Drain, a leading token that carries digits (pod names, ids) must not split the search space.
+        first = tokens[0] if tokens else ""
+        key = (len(tokens), WILDCARD if any(ch.isdigit() for ch in first) else first)
+        candidates = groups.setdefault(key, [])
+        best, best_score = None, SIMILARITY_THRESHOLD
+        for cluster in candidates:
+            score = cluster.similarity(tokens)
+            if score >= best_score:
+                best, best_score = cluster, score
+        if best is None:
+            best = _Cluster(tokens, timestamp, raw_lines[-1], index, source)
+            candidates.append(best)
+            clusters.append(best)
+        else:
+            best.add(tokens, timestamp, index, source)
+
+        if is_error_line(line):
+            error_line_count += 1
+            error_lines.append(raw_lines[-1])
+            if len(error_lines) > max_error_lines:
+                error_lines.pop(0)
+
+    clusters.sort(key=lambda c: c.count, reverse=True)
+    templates = [
+        LogTemplate(
+            template_id=f"t{i}",
+            template=" ".join(c.tokens),
+            count=c.count,
+            first_seen=c.first_seen,
+            last_seen=c.last_seen,
+            sample=c.sample,
+            sources=_by_count(c.sources),
+        )
+        for i, c in enumerate(clusters, start=1)
+    ]
+
+    log_id = hashlib.sha1("\n".join(raw_lines).encode("utf-8")).hexdigest()[:12]
+    _RAW_STORE[log_id] = (raw_lines, {f"t{i}": c.line_indexes for i, c in enumerate(clusters, start=1)})
+    _RAW_STORE.move_to_end(log_id)
+    while len(_RAW_STORE) > RAW_STORE_MAX_ENTRIES:
+        _RAW_STORE.popitem(last=False)
+
+    logger.info(f"Reduced {len(raw_lines)} log lines to {len(templates)} templates (log_id={log_id})")
+    return LogSummary(
+        log_id=log_id,
+        total_lines=len(raw_lines),
+        templates=templates[:max_templates],
+        omitted_templates=max(0, len(templates) - max_templates),
+        error_line_count=error_line_count,
+        error_lines=error_lines,
+        sources=_by_count(sources),
+    )
+
+
+def reduce_log_lines(lines: Iterable[str], **kwargs: Any) -> LogSummary:
+    """Reduce plain log lines, splitting a leading timestamp off each one."""
+    return reduce_log_entries(((*split_timestamp(line), None) for line in lines if line.strip()), **kwargs)
+
+
+def _unix_nanos_to_rfc3339(value: Any) -> str | None:
+    """Format a Unix timestamp in nanoseconds (int or digit string) as RFC3339Nano, keeping all nine digits."""
+    try:
+        nanos = int(value)
+    except (TypeError, ValueError):
+        return None
+    seconds, remainder = divmod(nanos, 1_000_000_000)
+    return f"{datetime.fromtimestamp(seconds, tz=timezone.utc):%Y-%m-%dT%H:%M:%S}.{remainder:09d}Z"
+
+
+def _stream_source(labels: Any) -> str | None:
+    """Render a Loki stream's identifying labels as a selector, e.g. '{app="api", pod="api-7d9f"}'."""
+    if not isinstance(labels, dict) or not labels:
+        return None
+    chosen = [(name, labels[name]) for name in SOURCE_LABELS if labels.get(name)] or sorted(labels.items())
+    return "{" + ", ".join(f'{name}="{value}"' for name, value in chosen) + "}"
+
+
+def _loki_entries(payload: Any) -> list[LogEntry] | None:
+    """Extract (timestamp, line, source) entries from Loki results, or None if the payload is not one.
+
+    Understands a Loki query_range response ({"data": {"result": [{"stream": {...}, "values": [[ns, line], ...]}]}})
+    and the entry list returned by the Grafana MCP query_loki_logs tool ([{"timestamp", "line", "labels"}, ...]).
+    """
+    entries: list[LogEntry] = []
+    if isinstance(payload, list):
+        for item in payload:
+            if not isinstance(item, dict) or "line" not in item:
+                return None
+            raw_ts = item.get("timestamp")
+            ts = _unix_nanos_to_rfc3339(raw_ts) if str(raw_ts).isdigit() else raw_ts
+            entries.append((str(ts) if ts else None, str(item["line"]), _stream_source(item.get("labels"))))
+    elif isinstance(payload, dict):
+        data = payload.get("data", payload)
+        result = data.get("result") if isinstance(data, dict) else None
+        if not isinstance(result, list):
+            return None
+        for stream in result:
+            if not isinstance(stream, dict):
+                continue
+            source = _stream_source(stream.get("stream"))
+            for value in stream.get("values", []):
+                if not isinstance(value, list) or len(value) < 2:
+                    continue
+                entries.append((_unix_nanos_to_rfc3339(value[0]), str(value[1]), source))
+    else:
+        return None
+    entries.sort(key=lambda e: timestamp_sort_key(e[0]) if e[0] else "")
+    return entries
+
+
+def reduce_log_text(text: str, **kwargs: Any) -> LogSummary:
+    """Reduce raw log text, a Loki query_range JSON response or a Grafana MCP log entry list."""
+    stripped = text.lstrip()
+    if stripped.startswith(("{", "[")):
+        try:
+            entries = _loki_entries(json.loads(stripped))
+        except (ValueError, AttributeError):
+            entries = None
+        if entries is not None:
+            return reduce_log_entries(entries, **kwargs)
+    return reduce_log_lines(text.splitlines(), **kwargs)
+
+
+def get_raw_lines(
+    log_id: str, template_id: str | None = None, offset: int = 0, limit: int = 200
+) -> list[str] | None:
+    """Return stored raw lines for a summary (optionally one template's lines), or None if evicted."""
+    stored = _RAW_STORE.get(log_id)
+    if stored is None:
+        return None
+    raw_lines, template_lines = stored
+    if template_id is None:
+        selected = raw_lines
+    else:
+        selected = [raw_lines[i] for i in template_lines.get(template_id, [])]
+    limit = max(1, min(limit, RAW_LINES_PAGE_MAX))
+    return selected[offset:offset + limit]
+
+
+@function_tool
+def get_raw_log_lines(
+    log_id: str,
+    template_id: str | None = None,
+    offset: int = 0,
+    limit: int = 200,
+) -> list[str] | str:
+    """Return the original lines behind a log summary.
+
+    Args:
+        log_id: The log_id printed at the top of a summary.
+        template_id: Only return lines matching this template (e.g. "t3"); all lines when omitted.
+        offset: Number of lines to skip.
+        limit: Maximum number of lines to return (capped at 500).
+
+    Returns:
+        list[str] | str: The raw lines or an error message.
+    """
+    lines = get_raw_lines(log_id, template_id, offset, limit)
+    if lines is None:
+        return f"Unknown or expired log_id '{log_id}'; fetch the logs again"
+    return lines
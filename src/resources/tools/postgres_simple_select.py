@@ -1,12 +1,21 @@
+import asyncio
+import base64
+from collections import OrderedDict
+from contextlib import asynccontextmanager
 from enum import Enum
+import hashlib
 import json
 import logging
 import os
 import re
+import time
+from typing import Any, AsyncIterator
 
 from pydantic import BaseModel, Field
-from sqlalchemy import create_engine, text
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
 from sqlalchemy.exc import SQLAlchemyError
+from sqlalchemy.ext.asyncio import AsyncConnection, AsyncEngine, create_async_engine
 
 from agents.tool import function_tool
 
@@ -18,12 +27,49 @@ QUERY_TEMPLATE = (
     "SELECT {columns} FROM {table} {where_clause} {order_by_clause} LIMIT {limit}"
 )
 
+AGGREGATE_QUERY_TEMPLATE = (
+    "SELECT {select_list} FROM {table} {where_clause} {group_by_clause} {having_clause} {order_by_clause} LIMIT {limit}"
+)
+
 LIMIT_MAX = 1000
 
+LIMIT_CLAUSE_PATTERN = re.compile(r"LIMIT \d+\s*$")
+
 ERROR_RECOVERY_MESSAGE = "try again with after fixing the error, if you think you are unable to fix the error, return the error and the why to the user"
 
 IS_VALID_QUERY_PARAMS_MESSAGE = "All good"
 
+POOL_SIZE = int(os.getenv("POSTGRES_POOL_SIZE", "5"))
+POOL_MAX_OVERFLOW = int(os.getenv("POSTGRES_POOL_MAX_OVERFLOW", "5"))
+POOL_RECYCLE_SECONDS = int(os.getenv("POSTGRES_POOL_RECYCLE_SECONDS", "1800"))
+STATEMENT_TIMEOUT_MS = int(os.getenv("POSTGRES_STATEMENT_TIMEOUT_MS", "30000"))
+CONNECT_TIMEOUT_SECONDS = float(os.getenv("POSTGRES_CONNECT_TIMEOUT_SECONDS", "5"))
+READ_REPLICA_RETRY_SECONDS = int(os.getenv("POSTGRES_READ_REPLICA_RETRY_SECONDS", "30"))
+CATALOG_TTL_SECONDS = int(os.getenv("POSTGRES_CATALOG_TTL_SECONDS", "600"))
+RESULT_MAX_BYTES = int(os.getenv("POSTGRES_RESULT_MAX_BYTES", "60000"))
+RESULT_FETCH_CHUNK_ROWS = int(os.getenv("POSTGRES_RESULT_FETCH_CHUNK_ROWS", "100"))
+RESULT_CACHE_TTL_SECONDS = int(os.getenv("POSTGRES_RESULT_CACHE_TTL_SECONDS", "60"))
+RESULT_CACHE_MAX_BYTES = int(os.getenv("POSTGRES_RESULT_CACHE_MAX_BYTES", str(32 * 1024 * 1024)))
+# EXPLAIN guard: plans above EXPLAIN_MAX_COST are rejected, plans above EXPLAIN_TIGHTEN_COST run with EXPLAIN_TIGHT_LIMIT
+EXPLAIN_MAX_COST = float(os.getenv("POSTGRES_EXPLAIN_MAX_COST", "1000000"))
+EXPLAIN_TIGHTEN_COST = float(os.getenv("POSTGRES_EXPLAIN_TIGHTEN_COST", "100000"))
+EXPLAIN_TIGHT_LIMIT = int(os.getenv("POSTGRES_EXPLAIN_TIGHT_LIMIT", "50"))
+# Per-table TTL overrides, like "telegram_management.sessions=10,public.countries=3600" (0 disables caching)
+RESULT_CACHE_TABLE_TTLS: dict[str, int] = {
+    name.strip(): int(ttl)
+    for name, ttl in (
+        item.split("=", 1) for item in os.getenv("POSTGRES_RESULT_CACHE_TABLE_TTLS", "").split(",") if "=" in item
+    )
+}
+
+CATALOG_SCHEMAS_SQL = "SELECT schema_name FROM information_schema.schemata"
+CATALOG_COLUMNS_SQL = (
+    "SELECT t.table_schema, t.table_name, t.table_type, c.column_name, c.udt_schema, c.udt_name "
+    "FROM information_schema.tables t "
+    "LEFT JOIN information_schema.columns c "
+    "ON c.table_schema = t.table_schema AND c.table_name = t.table_name"
+)
+
 class DatabaseName(str, Enum):
     ALTERYA_MAIN = "alterya_main"
     COLLECTION_MANAGEMENT = "collection_management"
@@ -31,6 +77,7 @@ class DatabaseName(str, Enum):
 
 class BaseQueryParams(BaseModel):
     database_name: DatabaseName = Field(description="A reference to the name of the database to select from - like telegram_management", default=DatabaseName.ALTERYA_MAIN)
+    refresh_catalog: bool = Field(description="reload the cached schema/table/column names before running - use only if a schema or table was just created", default=False)
 
 class SchemaQueryParams(BaseQueryParams):
     schema_name: str = Field(description="the name of the schema to select from - like telegram_management", default="telegram_management")
@@ -43,15 +90,244 @@ class QueryParams(SmallQueryParams):
     where: str | None = Field(description="the where clause to filter the data - like 'id = 1'", default=None)
     order_by: str | None = Field(description="the order by clause to sort the data - like 'id DESC'", default=None)
     limit: int = Field(description="the limit of the data to return - like 1000", default=1000)
+    cursor: str | None = Field(description="the next_cursor returned by a previous call - send it with the exact same query params to get the next page", default=None)
+    use_cache: bool = Field(description="set to false to bypass the result cache when you need fresh data", default=True)
+
+
+class AggregateFunction(str, Enum):
+    COUNT = "count"
+    SUM = "sum"
+    AVG = "avg"
+    MIN = "min"
+    MAX = "max"
+
+
+class DateTruncUnit(str, Enum):
+    MINUTE = "minute"
+    HOUR = "hour"
+    DAY = "day"
+    WEEK = "week"
+    MONTH = "month"
+    QUARTER = "quarter"
+    YEAR = "year"
+
+
+class Aggregate(BaseModel):
+    function: AggregateFunction = Field(description="the aggregate function to apply - like count", default=AggregateFunction.COUNT)
+    column: str = Field(description="the column to aggregate - use '*' only with count", default="*")
+    alias: str | None = Field(description="the output column name - like total_sessions, defaults to <function>_<column>", default=None)
+
+
+class DateBucket(BaseModel):
+    column: str = Field(description="the timestamp/date column to bucket - like created_at")
+    unit: DateTruncUnit = Field(description="the date_trunc bucket size - like day", default=DateTruncUnit.DAY)
+    alias: str = Field(description="the output column name of the bucket", default="bucket")
+
+
+class AggregateQueryParams(SmallQueryParams):
+    aggregates: list[Aggregate] = Field(description="the aggregates to compute - like [Aggregate(function='count', column='*')]", default_factory=lambda: [Aggregate()])
+    group_by: list[str] = Field(description="the columns to group by - like ['state']", default_factory=list)
+    date_bucket: DateBucket | None = Field(description="optional time bucket (date_trunc) to group by, returned as the first column", default=None)
+    where: str | None = Field(description="the where clause to filter the rows before aggregating - like 'created_at > now() - interval '1 day''", default=None)
+    having: str | None = Field(description="the having clause to filter groups - like 'count(*) > 10'", default=None)
+    order_by: str | None = Field(description="the order by clause over output columns or aliases - like 'count_all DESC'", default=None)
+    limit: int = Field(description="the maximal number of groups to return - like 100", default=100)
+    use_cache: bool = Field(description="set to false to bypass the result cache when you need fresh data", default=True)
+
+
+class TableCatalog(BaseModel):
+    table_type: str
+    columns: set[str] = Field(default_factory=set)
+    column_types: dict[str, str] = Field(default_factory=dict)
+
+
+class PlanEstimate(BaseModel):
+    cost: float = Field(description="the planner's total cost estimate for the query")
+    rows: int = Field(description="the planner's estimate of matching rows, before LIMIT")
+    limit_tightened_to: int | None = Field(description="the LIMIT the query was run with when it was tightened", default=None)
+
+
+class QueryPage(BaseModel):
+    columns: list[str]
+    encoded_rows: list[str]
+    total_count: int
+    truncated: bool
+    last_row: list[Any] | None = None
+    plan_estimate: PlanEstimate | None = None
 
 
-def _get_db_url(database_name: DatabaseName) -> str | None:
+class ResultCacheStats(BaseModel):
+    hits: int
+    misses: int
+    evictions: int
+    entries: int
+    size_bytes: int
+
+
+class ResultCache:
+    """LRU cache of query pages bounded by their encoded size, with a TTL per entry."""
+
+    def __init__(self, max_bytes: int):
+        self.max_bytes = max_bytes
+        self._entries: OrderedDict[tuple, tuple[float, int, QueryPage]] = OrderedDict()
+        self._size_bytes = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, key: tuple) -> QueryPage | None:
+        entry = self._entries.get(key)
+        if entry is None or entry[0] < time.monotonic():
+            if entry is not None:
+                self._remove(key)
+            self.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.hits += 1
+        return entry[2]
+
+    def put(self, key: tuple, page: QueryPage, ttl_seconds: int) -> None:
+        size = sum(len(row) for row in page.encoded_rows) + len(key[1])
+        if size > self.max_bytes:
+            return
+        if key in self._entries:
+            self._remove(key)
+        self._entries[key] = (time.monotonic() + ttl_seconds, size, page)
+        self._size_bytes += size
+        while self._size_bytes > self.max_bytes:
+            self._remove(next(iter(self._entries)))
+            self.evictions += 1
+
+    def stats(self) -> ResultCacheStats:
+        return ResultCacheStats(
+            hits=self.hits,
+            misses=self.misses,
+            evictions=self.evictions,
+            entries=len(self._entries),
+            size_bytes=self._size_bytes,
+        )
+
+    def _remove(self, key: tuple) -> None:
+        _, size, _ = self._entries.pop(key)
+        self._size_bytes -= size
+
+
+class DatabaseCatalog(BaseModel):
+    schemas: set[str]
+    tables: dict[str, dict[str, TableCatalog]]
+    loaded_at: float
+
+    def get_table(self, schema_name: str, table_name: str) -> TableCatalog | None:
+        return self.tables.get(schema_name, {}).get(table_name)
+
+
+def _get_db_url(database_name: DatabaseName, read_replica: bool = False) -> str | None:
+    """Return the primary URL, or the read-replica URL (<primary env var>_READ_REPLICA) when read_replica is set."""
     if database_name == DatabaseName.ALTERYA_MAIN:
-        return os.getenv("DATABASE_URL")
+        env_var = "DATABASE_URL"
     elif database_name == DatabaseName.COLLECTION_MANAGEMENT:
-        return os.getenv("DATABASE_URL_COLLECTION_MANAGEMENT")
+        env_var = "DATABASE_URL_COLLECTION_MANAGEMENT"
     else:
         return None
+    return os.getenv(f"{env_var}_READ_REPLICA" if read_replica else env_var)
+
+
+def _get_statement_timeout_ms(database_name: DatabaseName) -> int:
+    """Return the per-database statement timeout, like POSTGRES_STATEMENT_TIMEOUT_MS_ALTERYA_MAIN, else the global one."""
+    return int(os.getenv(f"POSTGRES_STATEMENT_TIMEOUT_MS_{database_name.name}", str(STATEMENT_TIMEOUT_MS)))
+
+
+_ENGINES: dict[tuple[DatabaseName, bool], AsyncEngine] = {}
+_READ_REPLICA_DOWN_UNTIL: dict[DatabaseName, float] = {}
+
+
+def _to_async_url(db_url: str) -> str:
+    """Point a plain postgres URL at the asyncpg driver.
+
+    asyncpg takes `ssl` instead of libpq's `sslmode`, so that query arg is renamed.
+    """
+    url = make_url(db_url).set(drivername="postgresql+asyncpg")
+    query = dict(url.query)
+    if "sslmode" in query:
+        query["ssl"] = query.pop("sslmode")
+    return url.set(query=query).render_as_string(hide_password=False)
+
+
+def _get_engine(database_name: DatabaseName, read_replica: bool = False) -> AsyncEngine | None:
+    """Return the process-wide pooled async engine for a database (or its read replica), creating it on first use.
+
+    Engines are kept for the lifetime of the process so tool calls reuse pooled
+    connections instead of paying a new TCP/TLS/auth handshake per query, and
+    queries run on asyncpg so a slow one never blocks the event loop.
+    Every session is read-only and bounded by the database's statement timeout.
+    """
+    engine = _ENGINES.get((database_name, read_replica))
+    if engine is not None:
+        return engine
+
+    db_url = _get_db_url(database_name, read_replica)
+    if not db_url:
+        return None
+
+    engine = create_async_engine(
+        _to_async_url(db_url),
+        pool_pre_ping=True,
+        pool_size=POOL_SIZE,
+        max_overflow=POOL_MAX_OVERFLOW,
+        pool_recycle=POOL_RECYCLE_SECONDS,
+        connect_args={
+            "timeout": CONNECT_TIMEOUT_SECONDS,
+            "server_settings": {
+                "statement_timeout": str(_get_statement_timeout_ms(database_name)),
+                "default_transaction_read_only": "on",
+            },
+        },
+    )
+    _ENGINES[(database_name, read_replica)] = engine
+    logger.info(f"Created pooled engine for database '{database_name.value}'{' (read replica)' if read_replica else ''}")
+    return engine
+
+
+@asynccontextmanager
+async def _connect_for_read(database_name: DatabaseName) -> AsyncIterator[AsyncConnection]:
+    """Yield a read-only connection, preferring the read replica and falling back to the primary.
+
+    A replica that fails to connect is skipped for READ_REPLICA_RETRY_SECONDS so
+    queries do not keep paying the connect timeout while it is down.
+
+    Raises:
+        ValueError: When the database has no primary URL configured.
+    """
+    conn: AsyncConnection | None = None
+    replica = _get_engine(database_name, read_replica=True)
+    if replica is not None and time.monotonic() >= _READ_REPLICA_DOWN_UNTIL.get(database_name, 0):
+        try:
+            conn = await replica.connect()
+        except (OSError, asyncio.TimeoutError, SQLAlchemyError) as exc:
+            logger.warning(
+                f"Read replica for '{database_name.value}' unavailable ({exc.__class__.__name__}); "
+                f"falling back to primary for {READ_REPLICA_RETRY_SECONDS}s"
+            )
+            _READ_REPLICA_DOWN_UNTIL[database_name] = time.monotonic() + READ_REPLICA_RETRY_SECONDS
+
+    if conn is None:
+        primary = _get_engine(database_name)
+        if primary is None:
+            raise ValueError("missing_database_url")
+        conn = await primary.connect()
+
+    try:
+        yield conn
+    finally:
+        await conn.close()
+
+
+async def dispose_engines() -> None:
+    """Close every pooled connection; call once when the process shuts down."""
+    for (database_name, read_replica), engine in list(_ENGINES.items()):
+        await engine.dispose()
+        logger.info(f"Disposed pooled engine for database '{database_name.value}'{' (read replica)' if read_replica else ''}")
+    _ENGINES.clear()
 
 
 def _is_safe_identifier(name: str) -> bool:
@@ -68,22 +344,30 @@ def _validate_where_clause(where: str) -> bool:
     return not any(token in where for token in suspicious)
 
 
-def _sanitize_order_by(order_by: str) -> str | None:
-    """Validate and normalize ORDER BY clause to 'col [ASC|DESC], ...'."""
-    parts: list[str] = []
+def _parse_order_by(order_by: str) -> list[tuple[str, str]] | None:
+    """Parse an ORDER BY clause into (column, ASC|DESC) pairs, or None when it is invalid."""
+    items: list[tuple[str, str]] = []
     for item in order_by.split(","):
         token = item.strip()
         if not token:
             continue
         tokens = token.split()
         col = tokens[0]
-        direction = tokens[1].upper() if len(tokens) > 1 else ""
+        direction = tokens[1].upper() if len(tokens) > 1 else "ASC"
         if not _is_safe_identifier(col):
             return None
-        if direction not in ("", "ASC", "DESC"):
+        if direction not in ("ASC", "DESC"):
             return None
-        parts.append(f"{col} {direction}".strip())
-    return ", ".join(parts) if parts else None
+        items.append((col, direction))
+    return items or None
+
+
+def _sanitize_order_by(order_by: str) -> str | None:
+    """Validate and normalize ORDER BY clause to 'col [ASC|DESC], ...'."""
+    items = _parse_order_by(order_by)
+    if items is None:
+        return None
+    return ", ".join(f"{col} {direction}" for col, direction in items)
 
 
 def _clamp_limit(limit: int) -> int:
@@ -91,24 +375,65 @@ def _clamp_limit(limit: int) -> int:
     return limit if limit < LIMIT_MAX else LIMIT_MAX
 
 
-def _build_columns_sql(requested_columns: list[str]) -> str:
-    """Return a validated column list for SELECT."""
+def _build_columns_sql(requested_columns: list[str], known_columns: set[str]) -> str:
+    """Return a validated column list for SELECT, checked against the table's catalog columns."""
     if requested_columns == ["*"]:
         return "*"
 
-    invalid_columns = [c for c in requested_columns if not _is_safe_identifier(c)]
+    invalid_columns = [
+        c for c in requested_columns if not _is_safe_identifier(c) or c not in known_columns
+    ]
     if invalid_columns:
         raise ValueError(f"invalid_column_name: {invalid_columns}")
     return ", ".join(requested_columns)
 
 
-def _build_where_clause(where: str | None) -> str:
-    """Return a validated WHERE clause fragment or an empty string."""
+def _validate_known_column(column: str, known_columns: set[str]) -> str:
+    """Return the column when it is a safe identifier that exists in the table, otherwise raise."""
+    if not _is_safe_identifier(column) or column not in known_columns:
+        raise ValueError(f"invalid_column_name: {column}")
+    return column
+
+
+def _validate_alias(alias: str) -> str:
+    """Return the alias when it is a plain identifier usable as an output column name, otherwise raise."""
+    if not _is_safe_identifier(alias) or "." in alias:
+        raise ValueError(f"invalid_alias: {alias}")
+    return alias
+
+
+def _build_aggregate_sql(aggregate: Aggregate, known_columns: set[str]) -> str:
+    """Return a validated '<FUNC>(<col>) AS <alias>' select item."""
+    if aggregate.column == "*":
+        if aggregate.function != AggregateFunction.COUNT:
+            raise ValueError(f"invalid_aggregate: {aggregate.function.value}(*) - only count accepts '*'")
+        column_sql = "*"
+        default_alias = f"{aggregate.function.value}_all"
+    else:
+        column_sql = _validate_known_column(aggregate.column, known_columns)
+        default_alias = f"{aggregate.function.value}_{aggregate.column}"
+    alias = _validate_alias(aggregate.alias or default_alias)
+    return f"{aggregate.function.value.upper()}({column_sql}) AS {alias}"
+
+
+def _build_where_clause(where: str | None, keyset_condition: str | None = None) -> str:
+    """Return a validated WHERE clause fragment (AND-ed with the keyset condition) or an empty string."""
+    if where is not None and not _validate_where_clause(where):
+        raise ValueError("invalid_where_clause")
+    if keyset_condition is None:
+        return f"WHERE {where}" if where is not None else ""
     if where is None:
+        return f"WHERE {keyset_condition}"
+    return f"WHERE ({where}) AND {keyset_condition}"
+
+
+def _build_having_clause(having: str | None) -> str:
+    """Return a validated HAVING clause fragment or an empty string."""
+    if having is None:
         return ""
-    if not _validate_where_clause(where):
-        raise ValueError("invalid_where_clause")
-    return f"WHERE {where}"
+    if not _validate_where_clause(having):
+        raise ValueError("invalid_having_clause")
+    return f"HAVING {having}"
 
 
 def _build_order_by_clause(order_by: str | None) -> str:
@@ -121,7 +446,79 @@ def _build_order_by_clause(order_by: str | None) -> str:
     return f"ORDER BY {sanitized}"
 
 
-def _build_select_sql(params: QueryParams) -> str:
+def _query_fingerprint(params: QueryParams) -> str:
+    """Identify the query a page cursor belongs to, so it cannot be replayed against another one."""
+    payload = json.dumps([
+        params.database_name.value,
+        params.schema_name,
+        params.table_name,
+        params.columns,
+        params.where,
+        params.order_by,
+    ])
+    return hashlib.sha256(payload.encode()).hexdigest()[:16]
+
+
+def _encode_cursor(fingerprint: str, key_values: list[str]) -> str:
+    payload = json.dumps({"q": fingerprint, "k": key_values})
+    return base64.urlsafe_b64encode(payload.encode()).decode()
+
+
+def _decode_cursor(cursor: str, fingerprint: str) -> list[str]:
+    """Return the keyset values stored in a cursor issued for this exact query."""
+    try:
+        payload = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+        cursor_fingerprint = payload["q"]
+        key_values = payload["k"]
+    except (ValueError, KeyError, TypeError):
+        raise ValueError("invalid_cursor: malformed cursor")
+    if cursor_fingerprint != fingerprint:
+        raise ValueError("invalid_cursor: the cursor belongs to a different query - resend the original query params with it")
+    return key_values
+
+
+def _build_keyset_condition(
+    order_items: list[tuple[str, str]], key_values: list[str], column_types: dict[str, str]
+) -> tuple[str, dict[str, str]]:
+    """Return a 'rows after the cursor' predicate over the ORDER BY columns plus its bind params.
+
+    Values travel as text and are cast back to the column type, so any type
+    Postgres can parse from text works. Uniform directions use a row comparison
+    that can be served by a composite index; mixed directions expand to ORs.
+    """
+    if len(key_values) != len(order_items):
+        raise ValueError("invalid_cursor: key does not match order_by")
+
+    bind_params = {f"keyset_{i}": value for i, value in enumerate(key_values)}
+    values_sql = [
+        f"CAST(CAST(:keyset_{i} AS text) AS {column_types[col]})" for i, (col, _) in enumerate(order_items)
+    ]
+    directions = {direction for _, direction in order_items}
+    if len(directions) == 1:
+        operator = ">" if directions == {"ASC"} else "<"
+        columns_sql = ", ".join(col for col, _ in order_items)
+        return f"({columns_sql}) {operator} ({', '.join(values_sql)})", bind_params
+
+    branches: list[str] = []
+    for i, (col, direction) in enumerate(order_items):
+        equal_prefix = [f"{order_items[j][0]} = {values_sql[j]}" for j in range(i)]
+        operator = ">" if direction == "ASC" else "<"
+        branches.append("(" + " AND ".join(equal_prefix + [f"{col} {operator} {values_sql[i]}"]) + ")")
+    return "(" + " OR ".join(branches) + ")", bind_params
+
+
+def _next_cursor(page: QueryPage, order_items: list[tuple[str, str]], fingerprint: str, limit: int) -> str | None:
+    """Build the cursor for the page after this one, or None when there is nothing left to read."""
+    if page.last_row is None or not (page.truncated or page.total_count >= limit):
+        return None
+    key_values = [page.last_row[page.columns.index(col)] for col, _ in order_items]
+    if any(value is None for value in key_values):
+        logger.warning("Cannot paginate past a NULL order_by value")
+        return None
+    return _encode_cursor(fingerprint, [str(value) for value in key_values])
+
+
+def _build_select_sql(params: QueryParams, known_columns: set[str], keyset_condition: str | None = None) -> str:
     """Construct the final SELECT statement from validated parts.
 
     This intentionally uses simple string composition, relying on strict
@@ -129,8 +526,16 @@ def _build_select_sql(params: QueryParams) -> str:
     """
     table_name = params.schema_name + "." + params.table_name
 
-    columns_sql = _build_columns_sql(params.columns)
-    where_clause = _build_where_clause(params.where)
+    requested_columns = params.columns
+    if params.order_by is not None and requested_columns != ["*"]:
+        # The page cursor is read from the ORDER BY columns, so they must be selected
+        order_items = _parse_order_by(params.order_by) or []
+        requested_columns = requested_columns + [
+            col for col, _ in order_items if col not in requested_columns
+        ]
+
+    columns_sql = _build_columns_sql(requested_columns, known_columns)
+    where_clause = _build_where_clause(params.where, keyset_condition)
     order_by_clause = _build_order_by_clause(params.order_by)
     clamped_limit = _clamp_limit(params.limit)
 
@@ -143,84 +548,335 @@ def _build_select_sql(params: QueryParams) -> str:
     )
 
 
-def _query_database(db_url: str, sql: str) -> str:
-    engine = None
-    try:
-        engine = create_engine(db_url, pool_pre_ping=True)
-        with engine.connect() as conn:
-            result = conn.execute(text(sql))
-            rows = [dict(row) for row in result.mappings().all()]
-            return json.dumps(rows, default=str)
-    except SQLAlchemyError as exc:
+def _build_aggregate_select_sql(params: AggregateQueryParams, known_columns: set[str]) -> str:
+    """Construct a GROUP BY/aggregate statement from validated parts.
+
+    Grouping expressions are referenced by ordinal in GROUP BY so the date bucket
+    expression does not have to be repeated.
+    """
+    if not params.aggregates and not params.group_by and params.date_bucket is None:
+        raise ValueError("invalid_aggregate_query: provide at least one aggregate, group_by column or date_bucket")
+
+    group_items: list[str] = []
+    if params.date_bucket is not None:
+        bucket_column = _validate_known_column(params.date_bucket.column, known_columns)
+        bucket_alias = _validate_alias(params.date_bucket.alias)
+        group_items.append(f"date_trunc('{params.date_bucket.unit.value}', {bucket_column}) AS {bucket_alias}")
+    group_items.extend(_validate_known_column(column, known_columns) for column in params.group_by)
+
+    aggregate_items = [_build_aggregate_sql(aggregate, known_columns) for aggregate in params.aggregates]
+    group_by_clause = (
+        "GROUP BY " + ", ".join(str(position) for position in range(1, len(group_items) + 1))
+        if group_items
+        else ""
+    )
+
+    return AGGREGATE_QUERY_TEMPLATE.format(
+        select_list=", ".join(group_items + aggregate_items),
+        table=params.schema_name + "." + params.table_name,
+        where_clause=_build_where_clause(params.where),
+        group_by_clause=group_by_clause,
+        having_clause=_build_having_clause(params.having),
+        order_by_clause=_build_order_by_clause(params.order_by),
+        limit=_clamp_limit(params.limit),
+    )
+
+
+async def _explain(conn: AsyncConnection, sql: str, params: dict[str, Any] | None = None) -> PlanEstimate:
+    """Return the planner's cost and row estimate for a query without running it."""
+    result = await conn.execute(text(f"EXPLAIN (FORMAT JSON) {sql}"), params or {})
+    plan_json = result.scalar_one()
+    plan = (json.loads(plan_json) if isinstance(plan_json, str) else plan_json)[0]["Plan"]
+    # Rows under a Limit node tell how much data the filter really matches
+    rows_plan = plan["Plans"][0] if plan.get("Node Type") == "Limit" and plan.get("Plans") else plan
+    return PlanEstimate(cost=plan["Total Cost"], rows=rows_plan["Plan Rows"])
+
+
+def _apply_cost_guard(sql: str, estimate: PlanEstimate) -> str:
+    """Reject plans over EXPLAIN_MAX_COST and cap the LIMIT of plans over EXPLAIN_TIGHTEN_COST.
+
+    Raises:
+        ValueError: When the estimated cost is over EXPLAIN_MAX_COST.
+    """
+    if estimate.cost > EXPLAIN_MAX_COST:
+        raise ValueError(
+            f"query_too_expensive: estimated cost {estimate.cost:.0f} (max {EXPLAIN_MAX_COST:.0f}), "
+            f"estimated matching rows {estimate.rows} - add a more selective where clause on indexed columns "
+            f"or aggregate with postgres_aggregate_select"
+        )
+    if estimate.cost > EXPLAIN_TIGHTEN_COST:
+        match = LIMIT_CLAUSE_PATTERN.search(sql)
+        if match and int(match.group().split()[1]) > EXPLAIN_TIGHT_LIMIT:
+            estimate.limit_tightened_to = EXPLAIN_TIGHT_LIMIT
+            logger.warning(f"Tightening LIMIT to {EXPLAIN_TIGHT_LIMIT} for estimated cost {estimate.cost:.0f}")
+            return sql[: match.start()] + f"LIMIT {EXPLAIN_TIGHT_LIMIT}"
+    return sql
+
+
+async def _stream_query(conn: AsyncConnection, sql: str, params: dict[str, Any] | None = None) -> QueryPage:
+    """Run a query through a server-side cursor and encode rows until RESULT_MAX_BYTES is reached.
+
+    Rows are pulled in chunks of RESULT_FETCH_CHUNK_ROWS. After the budget is hit the
+    (LIMIT-bounded) cursor is still drained, but only to count the rows left out.
+    """
+    result = await conn.stream(
+        text(sql).execution_options(yield_per=RESULT_FETCH_CHUNK_ROWS), params or {}
+    )
+    page = QueryPage(columns=list(result.keys()), encoded_rows=[], total_count=0, truncated=False)
+    used_bytes = 0
+    async for partition in result.partitions():
+        for row in partition:
+            page.total_count += 1
+            if page.truncated:
+                continue
+            encoded = json.dumps(list(row), default=str)
+            if used_bytes + len(encoded) + 1 > RESULT_MAX_BYTES:
+                page.truncated = True
+                continue
+            page.encoded_rows.append(encoded)
+            page.last_row = list(row)
+            used_bytes += len(encoded) + 1
+
+    if page.truncated:
+        logger.info(f"Result truncated at {len(page.encoded_rows)}/{page.total_count} rows ({RESULT_MAX_BYTES} bytes budget)")
+    return page
+
+
+def _render_query_page(page: QueryPage, **extra: Any) -> str:
+    """Render a page as compact columnar JSON.
+
+    The output looks like:
+    {"columns": [...], "rows": [[...], ...], "row_count": 10, "total_count": 250, "truncated": true}
+    where total_count is the number of rows the query produced, including the ones left out.
+    """
+    rendered = (
+        f'{{"columns": {json.dumps(page.columns)}, "rows": [{", ".join(page.encoded_rows)}], '
+        f'"row_count": {len(page.encoded_rows)}, "total_count": {page.total_count}, '
+        f'"truncated": {json.dumps(page.truncated)}'
+    )
+    if page.plan_estimate is not None:
+        extra = {"plan_estimate": page.plan_estimate.model_dump(exclude_none=True), **extra}
+    for key, value in extra.items():
+        rendered += f", {json.dumps(key)}: {json.dumps(value, default=str)}"
+    return rendered + "}"
+
+
+def _format_query_error(exc: Exception) -> str:
+    """Log and return the agent-facing message for a failed query."""
+    if isinstance(exc, ValueError):
+        logger.error(f"error: {exc} - {ERROR_RECOVERY_MESSAGE}")
+        return f"error: {exc} - {ERROR_RECOVERY_MESSAGE}"
+    if isinstance(exc, SQLAlchemyError):
         # Include the original DB error message to aid diagnosis without exposing secrets
         detail = str(getattr(exc, "orig", exc)).splitlines()[0]
         logger.error(f"error: database_operation_failed:{exc.__class__.__name__}:{detail} - {ERROR_RECOVERY_MESSAGE}")
         return f"error: database_operation_failed:{exc.__class__.__name__}:{detail} - {ERROR_RECOVERY_MESSAGE}"
-    except Exception as exc:  # pragma: no cover
-        logger.error(f"error: unexpected_failure:{exc.__class__.__name__} - {ERROR_RECOVERY_MESSAGE}")
-        return f"error: unexpected_failure:{exc.__class__.__name__} - {ERROR_RECOVERY_MESSAGE}"
-    finally:
-        if engine:
-            engine.dispose()
+    logger.error(f"error: unexpected_failure:{exc.__class__.__name__} - {ERROR_RECOVERY_MESSAGE}")
+    return f"error: unexpected_failure:{exc.__class__.__name__} - {ERROR_RECOVERY_MESSAGE}"
 
 
-def _get_all_schemas_in_db(db_url: str) -> str:
-    """Get all schemas from the database - Great for getting s first impression of the database"""
-    sql = "SELECT schema_name FROM information_schema.schemata ORDER BY schema_name"
-    return _query_database(db_url, sql)
+_RESULT_CACHE = ResultCache(RESULT_CACHE_MAX_BYTES)
 
 
-def _get_all_tables_in_schema(db_url: str, schema_name: str) -> str:
-    """get all tables in a schema from the database"""
-    sql = f"SELECT table_schema, table_name FROM information_schema.tables WHERE table_type = 'BASE TABLE' AND table_schema = '{schema_name}' ORDER BY table_name"
-    return _query_database(db_url, sql)
+def get_result_cache_stats() -> ResultCacheStats:
+    """Return hit/miss/eviction counters and the current size of the query result cache."""
+    return _RESULT_CACHE.stats()
 
 
-def _validate_schema_name(db_url: str, schema_name: str) -> bool:
-    """validate the schema name"""
-    if not _get_all_schemas_in_db(db_url):
-        return False
-    return True
+def _normalize_sql(sql: str) -> str:
+    """Collapse whitespace outside of string literals so formatting differences share a cache entry."""
+    parts = re.split(r"('(?:[^']|'')*')", sql.strip())
+    return "".join(part if i % 2 else re.sub(r"\s+", " ", part) for i, part in enumerate(parts))
 
 
-def _validate_table_name(db_url: str, schema_name: str, table_name: str) -> bool:
-    """validate the table name"""
-    if not _get_all_tables_in_schema(db_url, schema_name):
-        return False
-    return True
+async def _run_query(
+    database_name: DatabaseName,
+    table_name: str,
+    sql: str,
+    params: dict[str, Any] | None = None,
+    use_cache: bool = True,
+    cost_guard: bool = False,
+) -> QueryPage:
+    """Run a query through the result cache.
 
+    Entries live for the table's TTL (RESULT_CACHE_TABLE_TTLS, else RESULT_CACHE_TTL_SECONDS).
+    With use_cache=False the database is always hit, and the fresh page replaces the cached one.
+    With cost_guard=True a cache miss is EXPLAINed first and checked by _apply_cost_guard.
+    """
+    ttl_seconds = RESULT_CACHE_TABLE_TTLS.get(table_name, RESULT_CACHE_TTL_SECONDS)
+    key = (database_name.value, _normalize_sql(sql), tuple(sorted((params or {}).items())))
+    if use_cache and ttl_seconds > 0:
+        page = _RESULT_CACHE.get(key)
+        if page is not None:
+            logger.info(f"Result cache hit for {table_name} ({_RESULT_CACHE.hits} hits / {_RESULT_CACHE.misses} misses)")
+            return page
+
+    async with _connect_for_read(database_name) as conn:
+        estimate = None
+        if cost_guard:
+            estimate = await _explain(conn, sql, params)
+            logger.info(f"Plan estimate for {table_name}: cost={estimate.cost} rows={estimate.rows}")
+            sql_to_run = _apply_cost_guard(sql, estimate)
+        else:
+            sql_to_run = sql
+        page = await _stream_query(conn, sql_to_run, params)
+        page.plan_estimate = estimate
+    if ttl_seconds > 0:
+        _RESULT_CACHE.put(key, page, ttl_seconds)
+    return page
+
+
+async def _query_database(
+    database_name: DatabaseName,
+    table_name: str,
+    sql: str,
+    use_cache: bool = True,
+    cost_guard: bool = False,
+) -> str:
+    """Run a query and return a compact columnar JSON document, or an error message."""
+    try:
+        page = await _run_query(database_name, table_name, sql, use_cache=use_cache, cost_guard=cost_guard)
+    except Exception as exc:
+        return _format_query_error(exc)
+    return _render_query_page(page)
 
-def _validate_query_params(db_url: str, query_params: SmallQueryParams | QueryParams) -> str:
-    """validate the query params"""
-    if not _validate_schema_name(db_url, query_params.schema_name):
+
+_CATALOGS: dict[DatabaseName, DatabaseCatalog] = {}
+_CATALOG_LOCKS: dict[DatabaseName, asyncio.Lock] = {}
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+async def _load_catalog(database_name: DatabaseName) -> DatabaseCatalog:
+    """Read every schema, table and column name from information_schema in two round trips."""
+    async with _connect_for_read(database_name) as conn:
+        schema_rows = (await conn.execute(text(CATALOG_SCHEMAS_SQL))).all()
+        column_rows = (await conn.execute(text(CATALOG_COLUMNS_SQL))).all()
+
+    tables: dict[str, dict[str, TableCatalog]] = {}
+    for table_schema, table_name, table_type, column_name, udt_schema, udt_name in column_rows:
+        table = tables.setdefault(table_schema, {}).setdefault(
+            table_name, TableCatalog(table_type=table_type)
+        )
+        if column_name is not None:
+            table.columns.add(column_name)
+            table.column_types[column_name] = f"{_quote_identifier(udt_schema)}.{_quote_identifier(udt_name)}"
+
+    return DatabaseCatalog(
+        schemas={row[0] for row in schema_rows},
+        tables=tables,
+        loaded_at=time.monotonic(),
+    )
+
+
+def _is_catalog_fresh(catalog: DatabaseCatalog | None) -> bool:
+    return catalog is not None and time.monotonic() - catalog.loaded_at < CATALOG_TTL_SECONDS
+
+
+async def _get_catalog(
+    database_name: DatabaseName, refresh: bool = False
+) -> DatabaseCatalog:
+    """Return the cached catalog for a database, (re)loading it when missing, expired or refresh is requested.
+
+    Raises:
+        ValueError: When the catalog cannot be loaded from the database.
+    """
+    catalog = _CATALOGS.get(database_name)
+    if not refresh and catalog is not None and _is_catalog_fresh(catalog):
+        return catalog
+
+    lock = _CATALOG_LOCKS.setdefault(database_name, asyncio.Lock())
+    async with lock:
+        # Another task may have reloaded the catalog while we waited for the lock
+        reloaded = _CATALOGS.get(database_name)
+        if reloaded is not None and reloaded is not catalog and _is_catalog_fresh(reloaded):
+            return reloaded
+        try:
+            catalog = await _load_catalog(database_name)
+        except SQLAlchemyError as exc:
+            detail = str(getattr(exc, "orig", exc)).splitlines()[0]
+            raise ValueError(f"database_operation_failed:{exc.__class__.__name__}:{detail}")
+        except (OSError, asyncio.TimeoutError) as exc:
+            raise ValueError(f"database_connection_failed:{exc.__class__.__name__}")
+        _CATALOGS[database_name] = catalog
+        logger.info(
+            f"Loaded catalog for database '{database_name.value}': "
+            f"{len(catalog.schemas)} schemas, {sum(len(t) for t in catalog.tables.values())} tables"
+        )
+        return catalog
+
+
+def _validate_query_params(
+    catalog: DatabaseCatalog, schema_name: str | None = None, table_name: str | None = None
+) -> str:
+    """validate the given schema (and table) names against the cached catalog"""
+    if schema_name is not None and schema_name not in catalog.schemas:
         return "error: invalid_schema_name - check again in the database for the correct schema name"
-    if not _validate_table_name(db_url, query_params.schema_name, query_params.table_name):
+    if (
+        schema_name is not None
+        and table_name is not None
+        and catalog.get_table(schema_name, table_name) is None
+    ):
         return "error: invalid_table_name - check again in the database for the correct table name"
     return IS_VALID_QUERY_PARAMS_MESSAGE
 
 
+async def _get_validated_catalog(
+    query_params: SchemaQueryParams, schema_name: str | None = None, table_name: str | None = None
+) -> DatabaseCatalog | str:
+    """Return the catalog when the given schema/table exist (only those passed are checked), otherwise an error message."""
+    try:
+        catalog = await _get_catalog(query_params.database_name, refresh=query_params.refresh_catalog)
+    except ValueError as exc:
+        logger.error(f"error: {exc} - {ERROR_RECOVERY_MESSAGE}")
+        return f"error: {exc} - {ERROR_RECOVERY_MESSAGE}"
+
+    validation_message = _validate_query_params(catalog, schema_name, table_name)
+    if validation_message != IS_VALID_QUERY_PARAMS_MESSAGE:
+        return validation_message
+    return catalog
+
+
+async def _get_validated_table(query_params: SmallQueryParams) -> TableCatalog | str:
+    """Return the catalog entry of the table named by the query params, otherwise an error message."""
+    catalog = await _get_validated_catalog(query_params, query_params.schema_name, query_params.table_name)
+    if isinstance(catalog, str):
+        return catalog
+    table = catalog.get_table(query_params.schema_name, query_params.table_name)
+    if table is None:
+        return "error: invalid_table_name - check again in the database for the correct table name"
+    return table
+
+
 @function_tool
 async def get_all_schemas_in_db(query_params: SchemaQueryParams) -> str:
     """Get all schemas from the database - Great for getting s first impression of the database"""
-    db_url = _get_db_url(query_params.database_name)
-    if not db_url:
+    if _get_engine(query_params.database_name) is None:
         return "error: missing_database_url"
-    if not _validate_schema_name(db_url, query_params.schema_name):
-        return "error: invalid_schema_name - check again in the database for the correct schema name"
-    return _get_all_schemas_in_db(db_url)
+
+    catalog = await _get_validated_catalog(query_params)
+    if isinstance(catalog, str):
+        return catalog
+    return json.dumps([{"schema_name": name} for name in sorted(catalog.schemas)])
 
 
 @function_tool
 async def get_all_tables_in_schema(query_params: SmallQueryParams) -> str:
     """get all tables in a schema from the database"""
-    db_url = _get_db_url(query_params.database_name)
-    if not db_url:
+    if _get_engine(query_params.database_name) is None:
         return "error: missing_database_url"
 
-    validation_message = _validate_query_params(db_url, query_params)
-    if validation_message != IS_VALID_QUERY_PARAMS_MESSAGE:
-        return validation_message
-    return _get_all_tables_in_schema(db_url, query_params.schema_name)
+    catalog = await _get_validated_catalog(query_params, schema_name=query_params.schema_name)
+    if isinstance(catalog, str):
+        return catalog
+    tables = catalog.tables.get(query_params.schema_name, {})
+    return json.dumps([
+        {"table_schema": query_params.schema_name, "table_name": name}
+        for name, table in sorted(tables.items())
+        if table.table_type == "BASE TABLE"
+    ])
 
 
 @function_tool
@@ -232,27 +888,105 @@ async def postgres_simple_select(query_params: QueryParams) -> str:
         query_params: The query parameters to fetch the data for.
         should be something like:
         QueryParams(schema_and_table_name="telegram_management.sessions", columns=["*"], where="id = 1", order_by="id DESC", limit=1000)
+
+    Pagination: with an order_by (ending in a unique column such as id), a next_cursor is returned
+    while more rows may exist. Call again with the same params plus cursor=next_cursor for the next page.
+
+    Returns:
+        str: columnar JSON - {"columns": [...], "rows": [[...]], "row_count", "total_count", "truncated", "plan_estimate", "next_cursor"}.
+        When truncated is true the result hit the size budget; select fewer columns, filter further or follow next_cursor.
+        plan_estimate holds the planner's cost/rows; when limit_tightened_to is set the query was too costly for the
+        requested limit - refine the where clause. Queries far over budget are rejected with query_too_expensive.
     """
     logger.info(f"postgres_simple_select: {query_params}")
-    db_url = _get_db_url(query_params.database_name)
-    if not db_url:
+    if _get_engine(query_params.database_name) is None:
         return "error: missing_database_url"
 
-    validation_message = _validate_query_params(db_url, query_params)
-    if validation_message != IS_VALID_QUERY_PARAMS_MESSAGE:
-        return validation_message
+    table = await _get_validated_table(query_params)
+    if isinstance(table, str):
+        return table
 
+    fingerprint = _query_fingerprint(query_params)
+    order_items: list[tuple[str, str]] = []
+    keyset_condition = None
+    bind_params: dict[str, str] = {}
     try:
-        sql = _build_select_sql(query_params)
+        if query_params.order_by is not None:
+            order_items = _parse_order_by(query_params.order_by) or []
+            for col, _ in order_items:
+                _validate_known_column(col, table.columns)
+        if query_params.cursor is not None:
+            if not order_items:
+                raise ValueError("invalid_cursor: pagination requires the original order_by")
+            key_values = _decode_cursor(query_params.cursor, fingerprint)
+            keyset_condition, bind_params = _build_keyset_condition(order_items, key_values, table.column_types)
+        sql = _build_select_sql(query_params, table.columns, keyset_condition)
         logger.info(f"sql: {sql}")
     except ValueError as exc:
         # Preserve existing error format strings
         logger.error(f"error: {exc} - {ERROR_RECOVERY_MESSAGE}")
         return f"error: {exc} - {ERROR_RECOVERY_MESSAGE}"
 
-    return _query_database(db_url, sql)
+    try:
+        page = await _run_query(
+            query_params.database_name,
+            f"{query_params.schema_name}.{query_params.table_name}",
+            sql,
+            bind_params,
+            use_cache=query_params.use_cache,
+            cost_guard=True,
+        )
+    except Exception as exc:
+        return _format_query_error(exc)
+
+    effective_limit = _clamp_limit(query_params.limit)
+    if page.plan_estimate is not None and page.plan_estimate.limit_tightened_to is not None:
+        effective_limit = page.plan_estimate.limit_tightened_to
+    next_cursor = _next_cursor(page, order_items, fingerprint, effective_limit) if order_items else None
+    return _render_query_page(page, next_cursor=next_cursor)
 
 
+@function_tool
+async def postgres_aggregate_select(query_params: AggregateQueryParams) -> str:
+    """
+    postgres aggregate select tool - computes COUNT/SUM/AVG/MIN/MAX in the database, optionally grouped by columns
+    and/or a date_trunc time bucket, so only the small aggregated result is returned.
+    Prefer this over postgres_simple_select for counts, totals, averages and breakdowns.
+
+    Args:
+        query_params: The aggregate query parameters.
+        should be something like:
+        AggregateQueryParams(schema_name="telegram_management", table_name="sessions",
+            aggregates=[Aggregate(function="count", column="*")], group_by=["state"],
+            date_bucket=DateBucket(column="created_at", unit="day"),
+            where="created_at > now() - interval '7 days'", having="count(*) > 10", order_by="bucket DESC", limit=100)
+
+    Returns:
+        str: columnar JSON - {"columns": [...], "rows": [[...]], "row_count", "total_count", "truncated", "plan_estimate"}.
+    """
+    logger.info(f"postgres_aggregate_select: {query_params}")
+    if _get_engine(query_params.database_name) is None:
+        return "error: missing_database_url"
+
+    table = await _get_validated_table(query_params)
+    if isinstance(table, str):
+        return table
+
+    try:
+        sql = _build_aggregate_select_sql(query_params, table.columns)
+        logger.info(f"sql: {sql}")
+    except ValueError as exc:
+        logger.error(f"error: {exc} - {ERROR_RECOVERY_MESSAGE}")
+        return f"error: {exc} - {ERROR_RECOVERY_MESSAGE}"
+
+    return await _query_database(
+        query_params.database_name,
+        f"{query_params.schema_name}.{query_params.table_name}",
+        sql,
+        use_cache=query_params.use_cache,
+        cost_guard=True,
+    )
+
 
 @function_tool
 async def postgres_simple_select_example_run(small_query_params: SmallQueryParams) -> str:
@@ -264,19 +998,19 @@ async def postgres_simple_select_example_run(small_query_params: SmallQueryParam
         SmallQueryParams(schema_and_table_name="telegram_management.sessions")
 
     """
-    db_url = os.getenv("DATABASE_URL")
-    if not db_url:
+    if _get_engine(small_query_params.database_name) is None:
         return "error: missing_database_url"
 
-    try:
-        table_name = small_query_params.schema_name + "." + small_query_params.table_name
-        if not _is_safe_identifier(table_name):
-            logger.error(f"invalid_table_name: {table_name}")
-            return f"error: invalid_table_name: {table_name} - {ERROR_RECOVERY_MESSAGE}"
-        sql = f"SELECT * FROM {table_name} LIMIT 1"
-    except ValueError as exc:
-        # Preserve existing error format strings
-        logger.error(f"error: {exc} - {ERROR_RECOVERY_MESSAGE}")
-        return f"error: {exc} - {ERROR_RECOVERY_MESSAGE}"
+    catalog = await _get_validated_catalog(
+        small_query_params, small_query_params.schema_name, small_query_params.table_name
+    )
+    if isinstance(catalog, str):
+        return catalog
+
+    table_name = small_query_params.schema_name + "." + small_query_params.table_name
+    if not _is_safe_identifier(table_name):
+        logger.error(f"invalid_table_name: {table_name}")
+        return f"error: invalid_table_name: {table_name} - {ERROR_RECOVERY_MESSAGE}"
+    sql = f"SELECT * FROM {table_name} LIMIT 1"
 
-    return _query_database(db_url, sql)
\ No newline at end of file
+    return await _query_database(small_query_params.database_name, table_name, sql)
@@ -0,0 +1,40 @@
+import asyncio
+import importlib
+import json
+
+from mcp.types import CallToolResult, TextContent
+
+from resources.mcps.tools_cache import CachedToolsMCPServerStdio
+
+
+def _loki_entry(second: int, app: str, pod: str, line: str) -> dict:
+    return {
+        "timestamp": str(1735689600_000_000_000 + second * 1_000_000_000),
+        "line": line,
+        "labels": {"app": app, "pod": pod, "container": "main", "filename": "/var/log/app.log"},
+    }
+
+
+def test_query_loki_logs_summary_keeps_stream_labels(monkeypatch):
+    monkeypatch.setenv("GRAFANA_URL", "http://grafana.local")
+    monkeypatch.setenv("GRAFANA_API_KEY", "test")
+    grafana = importlib.import_module("resources.mcps.grafana")
+
+    entries = [_loki_entry(i, "checkout", f"checkout-{i % 2}", f"ERROR payment {i} declined") for i in range(30)]
+    entries += [_loki_entry(i, "search", "search-0", f"GET /search?q={i} 200") for i in range(10)]
+
+    async def call_tool(self, tool_name, arguments):
+        return CallToolResult(content=[TextContent(type="text", text=json.dumps(entries))])
+
+    monkeypatch.setattr(CachedToolsMCPServerStdio, "call_tool", call_tool, raising=False)
+
+    result = asyncio.run(grafana.MCP.call_tool("query_loki_logs", {"logql": '{app=~".+"}'}))
+    text = result.content[0].text
+
+    checkout = '{app="checkout", pod="checkout-0", container="main"}'
+    search = '{app="search", pod="search-0", container="main"}'
+    assert text.startswith("log_id=")
+    assert f"{checkout} x15" in text and f"{search} x10" in text
+    payment = next(t for t in result.structuredContent["templates"] if "payment" in t["template"])
+    assert set(payment["sources"]) == {checkout, '{app="checkout", pod="checkout-1", container="main"}'}
+    assert all(line.split(" ", 1)[1].startswith('{app="checkout"') for line in result.structuredContent["error_lines"])
@@ -0,0 +1,50 @@
+import asyncio
+import json
+import re
+from types import SimpleNamespace
+
+from agents.tool_context import ToolContext
+
+from app_agents.k8s_query import main as k8s_query
+from resources.tools import k8s
+
+
+def _ctx(tool_name: str) -> ToolContext:
+    return ToolContext(context=None, tool_name=tool_name, tool_call_id="1")
+
+
+def test_raw_log_lines_resolve_log_ids_from_pod_log_summaries(monkeypatch):
+    log_text = "\n".join(
+        f"2025-01-01T00:00:{i:02d}.000000000Z ERROR request {i} failed: upstream timeout" for i in range(40)
+    )
+
+    class FakeCoreV1Api:
+        def __init__(self, api_client):
+            pass
+
+        async def read_namespaced_pod_log(self, **kwargs):
+            return log_text
+
+    async def resolve_pod_container(namespace, pod_name, container_name):
+        return SimpleNamespace(), "app"
+
+    async def get_api_client():
+        return None
+
+    monkeypatch.setattr(k8s, "_resolve_pod_container", resolve_pod_container)
+    monkeypatch.setattr(k8s, "get_api_client", get_api_client)
+    monkeypatch.setattr(k8s.client, "CoreV1Api", FakeCoreV1Api)
+
+    async def run() -> str:
+        summary = await k8s_query.get_pod_logs.on_invoke_tool(
+            _ctx("get_pod_logs"),
+            json.dumps({"base_k8s_data": {"namespace": "enrichment", "pod": "web-abc-123"}, "previous": False}),
+        )
+        log_id = re.search(r"log_id=(\w+)", summary).group(1)
+        return await k8s_query.get_raw_log_lines.on_invoke_tool(
+            _ctx("get_raw_log_lines"), json.dumps({"log_id": log_id, "template_id": "t1", "limit": 5})
+        )
+
+    raw = asyncio.run(run())
+
+    assert raw[0] == "2025-01-01T00:00:00.000000000Z ERROR request 0 failed: upstream timeout"
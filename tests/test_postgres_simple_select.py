@@ -0,0 +1,78 @@
+import asyncio
+import json
+import time
+from contextlib import asynccontextmanager
+
+from agents.tool_context import ToolContext
+
+from resources.tools import postgres_simple_select as pg
+
+QUERY_SECONDS = 0.3
+
+
+class _SlowResult:
+    def keys(self):
+        return ["id"]
+
+    async def partitions(self):
+        yield [(1,)]
+
+
+class _SlowConnection:
+    """Stands in for an asyncpg-backed AsyncConnection whose queries take QUERY_SECONDS."""
+
+    async def stream(self, statement, params):
+        await asyncio.sleep(QUERY_SECONDS)
+        return _SlowResult()
+
+
+def test_overlapping_queries_do_not_block_the_event_loop(monkeypatch):
+    @asynccontextmanager
+    async def connect_for_read(database_name):
+        yield _SlowConnection()
+
+    catalog = pg.DatabaseCatalog(
+        schemas={"public"},
+        tables={
+            "public": {
+                "users": pg.TableCatalog(table_type="BASE TABLE", columns={"id"}),
+                "orders": pg.TableCatalog(table_type="BASE TABLE", columns={"id"}),
+            }
+        },
+        loaded_at=time.monotonic(),
+    )
+    monkeypatch.setitem(pg._CATALOGS, pg.DatabaseName.ALTERYA_MAIN, catalog)
+    monkeypatch.setattr(pg, "_get_engine", lambda *args, **kwargs: object())
+    monkeypatch.setattr(pg, "_connect_for_read", connect_for_read)
+    # Keep the rows this test reads out of the module-wide result cache.
+    monkeypatch.setattr(pg, "_RESULT_CACHE", pg.ResultCache(pg.RESULT_CACHE_MAX_BYTES))
+
+    async def run() -> tuple[list[str], float, int]:
+        ticks = 0
+
+        async def heartbeat():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        ctx = ToolContext(context=None, tool_name="postgres_simple_select_example_run", tool_call_id="1")
+        heartbeat_task = asyncio.create_task(heartbeat())
+        started = time.monotonic()
+        outputs = await asyncio.gather(*(
+            pg.postgres_simple_select_example_run.on_invoke_tool(
+                ctx, json.dumps({"small_query_params": {"schema_name": "public", "table_name": table}})
+            )
+            for table in ("users", "orders")
+        ))
+        elapsed = time.monotonic() - started
+        heartbeat_task.cancel()
+        return outputs, elapsed, ticks
+
+    outputs, elapsed, ticks = asyncio.run(run())
+
+    assert all(json.loads(output)["rows"] == [[1]] for output in outputs)
+    # Both queries overlapped rather than running back to back...
+    assert elapsed < 2 * QUERY_SECONDS
+    # ...and the loop kept serving other tasks while they waited on the database.
+    assert ticks >= QUERY_SECONDS / 0.01 / 2